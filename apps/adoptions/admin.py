@@ -17,7 +17,7 @@ class AdoptionApplicationAdmin(admin.ModelAdmin):
     list_display = ('applicant', 'pet', 'status', 'submitted_at', 'reviewed_at')
     list_filter = ('status', 'submitted_at', 'reviewed_at')
     search_fields = ('applicant__username', 'applicant__first_name', 'applicant__last_name', 'pet__name')
-    readonly_fields = ('submitted_at', 'reviewed_at', 'completed_at')
+    readonly_fields = ('submitted_at', 'reviewed_at', 'approved_at', 'completed_at')
     inlines = [AdoptionInterviewInline, AdoptionDocumentInline]
     
     fieldsets = (
@@ -37,7 +37,7 @@ class AdoptionApplicationAdmin(admin.ModelAdmin):
             'fields': ('additional_notes', 'reviewer_notes')
         }),
         ('Timestamps', {
-            'fields': ('submitted_at', 'reviewed_at', 'completed_at'),
+            'fields': ('submitted_at', 'reviewed_at', 'approved_at', 'completed_at'),
             'classes': ('collapse',)
         }),
     )
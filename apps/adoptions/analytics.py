@@ -0,0 +1,184 @@
+"""
+Adoption analytics rollups
+
+Applications are summarized into ``AdoptionDailyRollup`` rows, one per day,
+shelter and species. Each fact is dated by its own timestamp: submissions by
+``submitted_at``, approvals by ``approved_at``, rejections by ``reviewed_at``
+and adoptions by ``completed_at``. Each of these is written once, when the
+application enters that state. New activity therefore only ever lands on days at or
+after the last run. An incremental run rebuilds just the days since its
+checkpoint from indexed range scans. Analytics queries then read the
+pre-aggregated rows and never scan raw applications.
+"""
+import datetime
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import AdoptionApplication, AdoptionDailyRollup, RollupCheckpoint
+
+
+CHECKPOINT_NAME = 'adoption_daily'
+
+# Re-process this much before the checkpoint to catch transactions that
+# committed late with earlier timestamps
+CHECKPOINT_OVERLAP = datetime.timedelta(hours=1)
+
+INTERVALS = ('day', 'week', 'month')
+
+
+def _day_bounds(start_date, end_date):
+    start = timezone.make_aware(datetime.datetime.combine(start_date, datetime.time.min))
+    end = timezone.make_aware(datetime.datetime.combine(end_date + datetime.timedelta(days=1), datetime.time.min))
+    return start, end
+
+
+def _grouped(field, condition, start, end):
+    """(date, shelter ID, species) -> count of applications dated by ``field``"""
+    rows = AdoptionApplication.objects.filter(
+        condition, **{f'{field}__gte': start, f'{field}__lt': end}
+    ).annotate(
+        day=TruncDate(field), shelter_id=F('pet__shelter'), species=F('pet__species')
+    ).values('day', 'shelter_id', 'species').annotate(count=Count('pk')).order_by()
+    return {(row['day'], row['shelter_id'], row['species']): row['count'] for row in rows}
+
+
+@transaction.atomic
+def rebuild_rollups(start_date, end_date):
+    """Recompute the rollup rows for every day in ``[start_date, end_date]``"""
+    start, end = _day_bounds(start_date, end_date)
+    submitted = _grouped('submitted_at', Q(), start, end)
+    # Completed applications keep their approval date, so they are counted once
+    approved = _grouped('approved_at', Q(), start, end)
+    rejected = _grouped('reviewed_at', Q(status='rejected'), start, end)
+
+    durations = {}
+    completions = AdoptionApplication.objects.filter(
+        status='completed', completed_at__gte=start, completed_at__lt=end
+    ).annotate(day=TruncDate('completed_at')).values_list(
+        'day', 'pet__shelter', 'pet__species', 'completed_at', 'pet__created_at'
+    )
+    for day, shelter_id, species, completed_at, listed_at in completions:
+        days = max((completed_at - listed_at).days, 0)
+        durations.setdefault((day, shelter_id, species), Counter())[days] += 1
+
+    keys = set(submitted) | set(approved) | set(rejected) | set(durations)
+    AdoptionDailyRollup.objects.filter(date__gte=start_date, date__lte=end_date).delete()
+    AdoptionDailyRollup.objects.bulk_create([
+        AdoptionDailyRollup(
+            date=day,
+            shelter_id=shelter_id,
+            species=species,
+            applications_submitted=submitted.get((day, shelter_id, species), 0),
+            applications_approved=approved.get((day, shelter_id, species), 0),
+            applications_rejected=rejected.get((day, shelter_id, species), 0),
+            adoptions_completed=sum(durations.get((day, shelter_id, species), Counter()).values()),
+            days_to_adoption_total=sum(
+                days * count for days, count in durations.get((day, shelter_id, species), Counter()).items()
+            ),
+            days_to_adoption_histogram={
+                str(days): count for days, count in durations.get((day, shelter_id, species), Counter()).items()
+            },
+        )
+        for day, shelter_id, species in keys
+    ], batch_size=500)
+    return len(keys)
+
+
+def run_incremental(full=False):
+    """Roll up everything since the last checkpoint; returns (first day, rows written)"""
+    now = timezone.now()
+    checkpoint = RollupCheckpoint.objects.filter(name=CHECKPOINT_NAME).first()
+    if full or checkpoint is None:
+        first = AdoptionApplication.objects.order_by('submitted_at').values_list('submitted_at', flat=True).first()
+        start_date = timezone.localdate(first) if first else timezone.localdate(now)
+    else:
+        start_date = timezone.localdate(checkpoint.processed_until - CHECKPOINT_OVERLAP)
+
+    written = rebuild_rollups(start_date, timezone.localdate(now))
+    RollupCheckpoint.objects.update_or_create(name=CHECKPOINT_NAME, defaults={'processed_until': now})
+    return start_date, written
+
+
+def median_from_histogram(histogram):
+    """Median of the values counted by ``histogram`` (value -> count)"""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    values = sorted(histogram)
+    # Lower and upper middle ranks coincide for odd totals
+    ranks = ((total - 1) // 2, total // 2)
+    middle = []
+    seen = 0
+    for value in values:
+        seen += histogram[value]
+        while len(middle) < 2 and ranks[len(middle)] < seen:
+            middle.append(value)
+    return sum(middle) / 2
+
+
+def _bucket(day, interval):
+    if interval == 'week':
+        return day - datetime.timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def adoption_trends(start_date, end_date, shelter_id=None, species=None, interval='day'):
+    """Adoption series and summary over ``[start_date, end_date]`` from the rollups"""
+    rollups = AdoptionDailyRollup.objects.filter(date__gte=start_date, date__lte=end_date)
+    if shelter_id is not None:
+        rollups = rollups.filter(shelter_id=shelter_id)
+    if species:
+        rollups = rollups.filter(species=species)
+
+    buckets = {}
+    overall = Counter()
+    for row in rollups.values(
+        'date', 'applications_submitted', 'applications_approved', 'applications_rejected',
+        'adoptions_completed', 'days_to_adoption_total', 'days_to_adoption_histogram'
+    ).iterator():
+        bucket = buckets.setdefault(_bucket(row['date'], interval), {
+            'submitted': 0, 'approved': 0, 'rejected': 0, 'completed': 0,
+            'days_total': 0, 'histogram': Counter(),
+        })
+        bucket['submitted'] += row['applications_submitted']
+        bucket['approved'] += row['applications_approved']
+        bucket['rejected'] += row['applications_rejected']
+        bucket['completed'] += row['adoptions_completed']
+        bucket['days_total'] += row['days_to_adoption_total']
+        histogram = Counter({int(days): count for days, count in row['days_to_adoption_histogram'].items()})
+        bucket['histogram'].update(histogram)
+        overall.update(histogram)
+
+    def summarize(data):
+        reviewed = data['approved'] + data['rejected']
+        return {
+            'applications_submitted': data['submitted'],
+            'applications_approved': data['approved'],
+            'applications_rejected': data['rejected'],
+            'adoptions_completed': data['completed'],
+            'approval_rate': round(data['approved'] / reviewed, 4) if reviewed else None,
+            'mean_days_to_adoption': round(data['days_total'] / data['completed'], 1) if data['completed'] else None,
+            'median_days_to_adoption': median_from_histogram(data['histogram']),
+        }
+
+    totals = {
+        'submitted': sum(b['submitted'] for b in buckets.values()),
+        'approved': sum(b['approved'] for b in buckets.values()),
+        'rejected': sum(b['rejected'] for b in buckets.values()),
+        'completed': sum(b['completed'] for b in buckets.values()),
+        'days_total': sum(b['days_total'] for b in buckets.values()),
+        'histogram': overall,
+    }
+    return {
+        'interval': interval,
+        'start': start_date,
+        'end': end_date,
+        'summary': summarize(totals),
+        'series': [dict(period=period, **summarize(data)) for period, data in sorted(buckets.items())],
+    }
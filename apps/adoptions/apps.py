@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AdoptionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.adoptions'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.adoptions.analytics import run_incremental
+
+
+class Command(BaseCommand):
+    help = 'Aggregate adoption applications into the daily analytics rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild the rollups from the first application')
+
+    def handle(self, *args, **options):
+        start_date, written = run_incremental(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {written} day/shelter/species rows since {start_date}.'))
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adoptions', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adoptionapplication',
+            index=models.Index(fields=['submitted_at'], name='adoptions_a_submitt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adoptionapplication',
+            index=models.Index(fields=['reviewed_at'], name='adoptions_a_reviewe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adoptionapplication',
+            index=models.Index(fields=['completed_at'], name='adoptions_a_complet_idx'),
+        ),
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('processed_until', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AdoptionDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('species', models.CharField(max_length=20)),
+                ('applications_submitted', models.PositiveIntegerField(default=0)),
+                ('applications_approved', models.PositiveIntegerField(default=0)),
+                ('applications_rejected', models.PositiveIntegerField(default=0)),
+                ('adoptions_completed', models.PositiveIntegerField(default=0)),
+                ('days_to_adoption_total', models.PositiveIntegerField(default=0)),
+                ('days_to_adoption_histogram', models.JSONField(default=dict, help_text='Completed adoptions by days listed')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('shelter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adoption_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['date'],
+                'unique_together': {('date', 'shelter', 'species')},
+                'indexes': [models.Index(fields=['shelter', 'date'], name='adoptions_a_shelter_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_approved_at(apps, schema_editor):
+    # Best available approval date; completions reviewed through the API
+    # before this migration carry their completion time instead
+    AdoptionApplication = apps.get_model('adoptions', 'AdoptionApplication')
+    AdoptionApplication.objects.filter(
+        status__in=['approved', 'completed'], approved_at__isnull=True
+    ).update(approved_at=F('reviewed_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adoptions', '0003_adoption_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adoptionapplication',
+            name='approved_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='adoptionapplication',
+            index=models.Index(fields=['approved_at'], name='adoptions_a_approve_idx'),
+        ),
+        migrations.RunPython(backfill_approved_at, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
+from django.utils import timezone
 from apps.users.models import User
 from apps.pets.models import Pet
 
@@ -38,6 +39,7 @@ class AdoptionApplication(models.Model):
     # Timestamps
     submitted_at = models.DateTimeField(auto_now_add=True)
     reviewed_at = models.DateTimeField(null=True, blank=True)
+    approved_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
     # Review Information
@@ -46,6 +48,13 @@ class AdoptionApplication(models.Model):
     class Meta:
         ordering = ['-submitted_at']
         unique_together = ['applicant', 'pet']
+        indexes = [
+            # Range scans of the analytics rollup pipeline
+            models.Index(fields=['submitted_at'], name='adoptions_a_submitt_idx'),
+            models.Index(fields=['reviewed_at'], name='adoptions_a_reviewe_idx'),
+            models.Index(fields=['approved_at'], name='adoptions_a_approve_idx'),
+            models.Index(fields=['completed_at'], name='adoptions_a_complet_idx'),
+        ]
     
     def __str__(self):
         return f"Application by {self.applicant.username} for {self.pet.name}"
@@ -64,6 +73,18 @@ class AdoptionApplication(models.Model):
     @property
     def can_be_completed(self):
         return self.status == 'approved'
+    
+    def complete(self, completed_at=None):
+        """Complete the adoption, mark the pet adopted and tell its other favoriters"""
+        from apps.notifications.fanout import notify_favoriters_adopted
+        
+        with transaction.atomic():
+            self.status = 'completed'
+            self.completed_at = completed_at or timezone.now()
+            self.save()
+            self.pet.status = 'adopted'
+            self.pet.save()
+            transaction.on_commit(lambda: notify_favoriters_adopted(self))
 
 
 class AdoptionInterview(models.Model):
@@ -117,3 +138,40 @@ class AdoptionDocument(models.Model):
     
     def __str__(self):
         return f"{self.title} - {self.application}"
+
+
+class AdoptionDailyRollup(models.Model):
+    """Adoption facts for one day, shelter and species"""
+    date = models.DateField()
+    shelter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='adoption_rollups')
+    species = models.CharField(max_length=20)
+    
+    applications_submitted = models.PositiveIntegerField(default=0)
+    applications_approved = models.PositiveIntegerField(default=0)
+    applications_rejected = models.PositiveIntegerField(default=0)
+    adoptions_completed = models.PositiveIntegerField(default=0)
+    
+    # Whole days from listing to completed adoption, for means and medians
+    days_to_adoption_total = models.PositiveIntegerField(default=0)
+    days_to_adoption_histogram = models.JSONField(default=dict, help_text="Completed adoptions by days listed")
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['date']
+        unique_together = ['date', 'shelter', 'species']
+        indexes = [
+            models.Index(fields=['shelter', 'date'], name='adoptions_a_shelter_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.shelter.username} {self.species}"
+
+
+class RollupCheckpoint(models.Model):
+    """How far an incremental rollup has processed its source rows"""
+    name = models.CharField(max_length=50, unique=True)
+    processed_until = models.DateTimeField()
+    
+    def __str__(self):
+        return f"{self.name} @ {self.processed_until}"
@@ -0,0 +1,17 @@
+"""
+Signal handlers tracking adoption application status transitions
+"""
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from .models import AdoptionApplication
+
+
+@receiver(pre_save, sender=AdoptionApplication)
+def remember_application_status(sender, instance, **kwargs):
+    # Lets post_save handlers tell status transitions from other edits
+    instance._previous_status = None
+    if instance.pk:
+        instance._previous_status = (
+            AdoptionApplication.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+        )
@@ -0,0 +1,83 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.adoptions.analytics import adoption_trends, rebuild_rollups
+from apps.adoptions.models import AdoptionApplication, AdoptionDailyRollup
+from apps.pets.models import Pet
+from apps.users.models import User
+
+
+def make_pet(shelter, name):
+    return Pet.objects.create(
+        name=name, species='dog', breed='Beagle', age_years=2, age_months=0,
+        gender='male', size='medium', weight=Decimal('20.0'), color='Brown',
+        shelter=shelter, description='Friendly', adoption_fee=Decimal('100.00'),
+    )
+
+
+def make_application(applicant, pet, **timestamps):
+    application = AdoptionApplication.objects.create(
+        applicant=applicant, pet=pet, reason_for_adoption='r', experience_with_pets='e',
+        living_situation='l', work_schedule='w', emergency_contact_name='n',
+        emergency_contact_phone='+1234567890', emergency_contact_relationship='friend',
+    )
+    AdoptionApplication.objects.filter(pk=application.pk).update(**timestamps)
+    return application
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.shelter = User.objects.create_user(username='shelter', password='x', user_type='shelter')
+        self.today = timezone.localdate()
+        self.days = [self.today - datetime.timedelta(days=offset) for offset in (3, 2, 1, 0)]
+
+        def at(day, hour=12):
+            return timezone.make_aware(datetime.datetime.combine(day, datetime.time(hour)))
+
+        for index in range(4):
+            adopter = User.objects.create_user(username=f'adopter{index}', password='x')
+            pet = make_pet(self.shelter, f'pet{index}')
+            Pet.objects.filter(pk=pet.pk).update(created_at=at(self.days[0], 8))
+            if index == 0:
+                # Approved on day 1, completed on day 3: one approval, one adoption
+                make_application(
+                    adopter, pet, status='completed', submitted_at=at(self.days[0]),
+                    reviewed_at=at(self.days[1]), approved_at=at(self.days[1]), completed_at=at(self.days[3]),
+                )
+            elif index == 1:
+                make_application(
+                    adopter, pet, status='rejected', submitted_at=at(self.days[1]), reviewed_at=at(self.days[2]),
+                )
+            elif index == 2:
+                make_application(
+                    adopter, pet, status='approved', submitted_at=at(self.days[2]),
+                    reviewed_at=at(self.days[2]), approved_at=at(self.days[2]),
+                )
+            else:
+                make_application(adopter, pet, status='pending', submitted_at=at(self.days[3]))
+
+    def snapshot(self):
+        return sorted(AdoptionDailyRollup.objects.values_list(
+            'date', 'shelter_id', 'species', 'applications_submitted', 'applications_approved',
+            'applications_rejected', 'adoptions_completed', 'days_to_adoption_total'
+        ))
+
+    def test_incremental_days_match_a_full_rebuild(self):
+        rebuild_rollups(self.days[0], self.days[-1])
+        full = self.snapshot()
+        AdoptionDailyRollup.objects.all().delete()
+        for day in self.days:
+            rebuild_rollups(day, day)
+        self.assertEqual(self.snapshot(), full)
+
+    def test_completed_application_counts_one_approval(self):
+        rebuild_rollups(self.days[0], self.days[-1])
+        summary = adoption_trends(self.days[0], self.days[-1], shelter_id=self.shelter.pk)['summary']
+        self.assertEqual(summary['applications_submitted'], 4)
+        self.assertEqual(summary['applications_approved'], 2)
+        self.assertEqual(summary['applications_rejected'], 1)
+        self.assertEqual(summary['adoptions_completed'], 1)
+        self.assertEqual(summary['median_days_to_adoption'], 3)
@@ -0,0 +1,29 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from .test_analytics import make_application, make_pet
+
+
+class CompletionTests(TestCase):
+    def setUp(self):
+        self.shelter = User.objects.create_user(username='shelter', password='x', user_type='shelter')
+        adopter = User.objects.create_user(username='adopter', password='x')
+        self.application = make_application(adopter, make_pet(self.shelter, 'Buddy'), status='approved')
+
+    @mock.patch('apps.notifications.fanout.notify_favoriters_adopted')
+    def test_api_completion_notifies_favoriters_after_commit(self, notify):
+        client = APIClient()
+        client.force_authenticate(self.shelter)
+        url = reverse('api:update-application-status', args=[self.application.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(url, {'status': 'completed'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, 'completed')
+        self.assertEqual(self.application.pet.status, 'adopted')
+        notify.assert_called_once()
@@ -3,6 +3,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
+from django.db import transaction
 from django.urls import reverse_lazy
 from django.utils import timezone
 from .models import AdoptionApplication, AdoptionInterview, AdoptionDocument
@@ -80,13 +81,14 @@ def approve_application(request, pk):
         return redirect('adoptions:list')
     
     if application.can_be_approved:
-        application.status = 'approved'
-        application.reviewed_at = timezone.now()
-        application.save()
-        
-        # Update pet status to pending
-        application.pet.status = 'pending'
-        application.pet.save()
+        with transaction.atomic():
+            application.status = 'approved'
+            application.reviewed_at = application.approved_at = timezone.now()
+            application.save()
+            
+            # Update pet status to pending
+            application.pet.status = 'pending'
+            application.pet.save()
         
         messages.success(request, f'Application for {application.pet.name} has been approved.')
     else:
@@ -105,9 +107,10 @@ def reject_application(request, pk):
         return redirect('adoptions:list')
     
     if application.can_be_rejected:
-        application.status = 'rejected'
-        application.reviewed_at = timezone.now()
-        application.save()
+        with transaction.atomic():
+            application.status = 'rejected'
+            application.reviewed_at = timezone.now()
+            application.save()
         
         messages.success(request, f'Application for {application.pet.name} has been rejected.')
     else:
@@ -126,13 +129,7 @@ def complete_adoption(request, pk):
         return redirect('adoptions:list')
     
     if application.can_be_completed:
-        application.status = 'completed'
-        application.completed_at = timezone.now()
-        application.save()
-        
-        # Update pet status to adopted
-        application.pet.status = 'adopted'
-        application.pet.save()
+        application.complete()
         
         messages.success(request, f'Adoption of {application.pet.name} has been completed!')
     else:
@@ -3,12 +3,17 @@ API Filters for Pet Adoption Platform
 """
 import django_filters
 from django import forms
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
 from apps.pets.models import Pet
+from apps.pets.bitmaps import bitmap_predicates, narrow_queryset
+from apps.pets.fuzzy import breed_q
+from apps.pets.search import full_text_search
 
 
 class PetFilter(django_filters.FilterSet):
     name = django_filters.CharFilter(lookup_expr='icontains')
-    breed = django_filters.CharFilter(lookup_expr='icontains')
+    breed = django_filters.CharFilter(method='filter_breed')
     species = django_filters.ChoiceFilter(choices=Pet.SPECIES_CHOICES)
     size = django_filters.ChoiceFilter(choices=Pet.SIZE_CHOICES)
     gender = django_filters.ChoiceFilter(choices=Pet.GENDER_CHOICES)
@@ -45,3 +50,31 @@ class PetFilter(django_filters.FilterSet):
             'good_with_kids', 'good_with_dogs', 'good_with_cats',
             'house_trained', 'is_spayed_neutered', 'is_vaccinated'
         ]
+    
+    def filter_queryset(self, queryset):
+        # Resolve indexed flag/enum predicates with bitmaps before any SQL runs
+        queryset = narrow_queryset(queryset, bitmap_predicates(self.form.cleaned_data))
+        return super().filter_queryset(queryset)
+    
+    def filter_breed(self, queryset, name, value):
+        # Substring match, widened to similar breeds when the trigram index is on
+        return queryset.filter(breed_q(value, self.form.cleaned_data.get('species')))
+
+
+class PetSearchFilter(SearchFilter):
+    """
+    SearchFilter backed by the pet full-text index.
+
+    Hits are ranked by relevance unless the client asked for an explicit
+    ordering, so this backend must run after OrderingFilter.
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        text = ' '.join(self.get_search_terms(request))
+        if not text:
+            return queryset
+        
+        queryset = full_text_search(queryset, text)
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by('-search_rank', '-created_at')
+        return queryset
@@ -3,9 +3,11 @@ API Serializers for Pet Adoption Platform
 """
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.db import models
 from apps.users.models import User, ShelterProfile, AdopterProfile
 from apps.pets.models import Pet, PetImage, PetFavorite
 from apps.adoptions.models import AdoptionApplication, AdoptionInterview, AdoptionDocument
+from apps.notifications.models import Notification, SavedSearch
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -79,6 +81,57 @@ class AdopterProfileSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+def _favorite_status(request):
+    if not hasattr(request, '_favorite_status'):
+        request._favorite_status = {}
+    return request._favorite_status
+
+
+def prime_favorites(request, pet_ids):
+    """Load the user's favorite status for ``pet_ids`` in a single query"""
+    if not (request and request.user.is_authenticated):
+        return
+    status = _favorite_status(request)
+    missing = set(pet_ids) - status.keys()
+    if missing:
+        favorited = set(
+            PetFavorite.objects.filter(user=request.user, pet_id__in=missing)
+            .values_list('pet_id', flat=True)
+        )
+        for pet_id in missing:
+            status[pet_id] = pet_id in favorited
+
+
+def is_favorited(request, pet):
+    """Favorite status of ``pet``, answered from the per-request cache when primed"""
+    if not (request and request.user.is_authenticated):
+        return False
+    status = _favorite_status(request)
+    if pet.pk not in status:
+        prime_favorites(request, [pet.pk])
+    return status[pet.pk]
+
+
+class PrimingListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that primes the favorites cache for the whole page before
+    serializing its items, so ``is_favorited`` costs one query per page.
+    """
+    
+    def get_pet_ids(self, items):
+        return [item.pk for item in items]
+    
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        prime_favorites(self.context.get('request'), self.get_pet_ids(items))
+        return super().to_representation(items)
+
+
+class ApplicationPrimingListSerializer(PrimingListSerializer):
+    def get_pet_ids(self, items):
+        return [item.pet_id for item in items]
+
+
 class PetImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = PetImage
@@ -99,9 +152,13 @@ class PetListSerializer(serializers.ModelSerializer):
                  'good_with_kids', 'good_with_dogs', 'good_with_cats', 'house_trained',
                  'is_spayed_neutered', 'is_vaccinated', 'shelter_name', 'shelter_city',
                  'main_image', 'is_favorited', 'created_at']
+        list_serializer_class = PrimingListSerializer
     
     def get_main_image(self, obj):
-        main_image = obj.main_image
+        if hasattr(obj, 'main_images'):
+            main_image = obj.main_images[0] if obj.main_images else None
+        else:
+            main_image = obj.main_image
         if main_image:
             request = self.context.get('request')
             if request:
@@ -109,10 +166,7 @@ class PetListSerializer(serializers.ModelSerializer):
         return None
     
     def get_is_favorited(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return PetFavorite.objects.filter(user=request.user, pet=obj).exists()
-        return False
+        return is_favorited(self.context.get('request'), obj)
 
 
 class PetDetailSerializer(serializers.ModelSerializer):
@@ -127,10 +181,7 @@ class PetDetailSerializer(serializers.ModelSerializer):
         fields = '__all__'
     
     def get_is_favorited(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return PetFavorite.objects.filter(user=request.user, pet=obj).exists()
-        return False
+        return is_favorited(self.context.get('request'), obj)
     
     def get_can_apply(self, obj):
         request = self.context.get('request')
@@ -174,7 +225,8 @@ class AdoptionApplicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = AdoptionApplication
         fields = '__all__'
-        read_only_fields = ['applicant', 'submitted_at', 'reviewed_at', 'completed_at']
+        read_only_fields = ['applicant', 'submitted_at', 'reviewed_at', 'approved_at', 'completed_at']
+        list_serializer_class = ApplicationPrimingListSerializer
     
     def create(self, validated_data):
         pet_id = validated_data.pop('pet_id')
@@ -224,3 +276,35 @@ class SearchSerializer(serializers.Serializer):
     house_trained = serializers.BooleanField(required=False)
     max_fee = serializers.DecimalField(required=False, max_digits=8, decimal_places=2)
     location = serializers.CharField(required=False, allow_blank=True)
+    near_zip = serializers.CharField(required=False, allow_blank=True, max_length=10)
+    radius_miles = serializers.FloatField(required=False, min_value=1, max_value=500, default=25)
+    sort = serializers.ChoiceField(
+        choices=['newest', 'relevance'], required=False, default='newest'
+    )
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SavedSearch
+        fields = ['id', 'name', 'filters', 'is_active', 'created_at', 'last_notified_at']
+        read_only_fields = ['id', 'created_at', 'last_notified_at']
+    
+    def validate_filters(self, value):
+        search = SearchSerializer(data=value)
+        search.is_valid(raise_exception=True)
+        # Store the JSON representation; omitted fields stay omitted
+        return {name: item for name, item in search.data.items() if name in value}
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    sender_username = serializers.CharField(source='sender.username', default=None, read_only=True)
+    pet_name = serializers.CharField(source='pet.name', default=None, read_only=True)
+    
+    class Meta:
+        model = Notification
+        fields = [
+            'id', 'notification_type', 'title', 'message', 'is_read', 'is_important',
+            'created_at', 'read_at', 'sender', 'sender_username', 'pet', 'pet_name',
+            'adoption_application'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,19 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+
+class RadiusSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_unknown_zip_searches_without_a_radius_and_says_so(self):
+        response = APIClient().post(reverse('api:search-pets'), {'near_zip': '99999'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('99999', response.data['warnings'][0])
+
+    def test_known_zip_reports_no_warning(self):
+        response = APIClient().post(reverse('api:search-pets'), {'near_zip': '10001'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('warnings', response.data)
@@ -16,15 +16,25 @@ urlpatterns = [
     # Pets
     path('pets/', views.PetListCreateView.as_view(), name='pet-list'),
     path('pets/<int:pk>/', views.PetDetailView.as_view(), name='pet-detail'),
+    path('pets/<int:pk>/similar/', views.similar_pets, name='similar-pets'),
     path('pets/<int:pet_id>/favorite/', views.toggle_favorite, name='toggle-favorite'),
     path('pets/search/', views.search_pets, name='search-pets'),
+    path('pets/facets/', views.pet_facets, name='pet-facets'),
+    path('pets/autocomplete/', views.pet_autocomplete, name='pet-autocomplete'),
     path('pets/favorites/', views.FavoritePetsView.as_view(), name='favorite-pets'),
+    path('notifications/', views.NotificationInboxView.as_view(), name='notification-inbox'),
+    path('saved-searches/', views.SavedSearchListCreateView.as_view(), name='saved-search-list'),
+    path('saved-searches/<int:pk>/', views.SavedSearchDetailView.as_view(), name='saved-search-detail'),
+    path('pets/recommended/', views.recommended_pets, name='recommended-pets'),
     
     # Adoptions
     path('adoptions/', views.AdoptionApplicationListCreateView.as_view(), name='adoption-list'),
     path('adoptions/<int:pk>/', views.AdoptionApplicationDetailView.as_view(), name='adoption-detail'),
     path('adoptions/<int:application_id>/status/', views.update_application_status, name='update-application-status'),
     
+    # Analytics
+    path('analytics/adoptions/', views.adoption_analytics, name='adoption-analytics'),
+    
     # Platform
     path('stats/', views.platform_stats, name='platform-stats'),
 ]
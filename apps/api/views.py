@@ -1,21 +1,46 @@
 """
 API Views for Pet Adoption Platform
 """
+from datetime import timedelta
+
 from rest_framework import generics, status, permissions, filters
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.contrib.auth import login
-from django.db.models import Q, Count
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, F, Case, When, Value, FloatField
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 
+from apps.users.geo import geocode, nearby_shelters
 from apps.users.models import User, ShelterProfile, AdopterProfile
 from apps.pets.models import Pet, PetFavorite
+from apps.adoptions.analytics import INTERVALS as ANALYTICS_INTERVALS, adoption_trends
 from apps.adoptions.models import AdoptionApplication
+from apps.notifications.models import SavedSearch
+from apps.notifications.querysets import inbox_queryset
+from apps.core.pagination import KeysetPaginator, InvalidCursor
+from apps.core.stats import get_stats
+from apps.pets.autocomplete import KINDS as AUTOCOMPLETE_KINDS, autocomplete_index
+from apps.pets.bitmaps import bitmap_predicates, narrow_queryset
+from apps.pets.catalog import catalog, catalog_enabled, criteria_from_search, hydrate
+from apps.pets.facets import get_facets
+from apps.pets.fuzzy import breed_q
+from apps.pets.filters import PetFilter as PetSidebarFilter
+from apps.pets.querysets import with_list_projection
+from apps.pets.ranking import RankedResults
+from apps.pets.recommendations import DEFAULT_LIMIT as RECOMMENDATION_LIMIT, recommend_pets
+from apps.pets.search import full_text_search, search_cache_key
+from apps.pets.similar import DEFAULT_LIMIT as SIMILAR_LIMIT, similar_pets as find_similar_pets
 from .serializers import *
-from .filters import PetFilter
+from .filters import PetFilter, PetSearchFilter
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -24,6 +49,65 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
+class CursorResultsSetPagination(BasePagination):
+    """
+    Keyset pagination on the queryset's ordering (``-created_at`` by default),
+    so deep pages cost the same as the first one and no COUNT(*) is issued.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 12
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    default_ordering = ('-created_at', '-id')
+    
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+    
+    def get_ordering(self, queryset):
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        return ordering or self.default_ordering
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginator = KeysetPaginator(
+            queryset, self.get_ordering(queryset), self.get_page_size(request)
+        )
+        try:
+            self.page = paginator.page(request.query_params.get(self.cursor_query_param) or None)
+        except InvalidCursor:
+            raise NotFound('Invalid cursor')
+        return list(self.page)
+    
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+    
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_link(self.page.next_cursor),
+            'previous': self.get_link(self.page.previous_cursor),
+            'results': data,
+        })
+
+
+class CursorPaginationMixin:
+    """Use cursor pagination when the client sends a ``cursor`` parameter"""
+    cursor_pagination_class = CursorResultsSetPagination
+    
+    @property
+    def paginator(self):
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        if not hasattr(self, '_paginator') and cursor_param in self.request.query_params:
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+
 class UserRegistrationView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
@@ -70,15 +154,21 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         return self.request.user
 
 
-class PetListCreateView(generics.ListCreateAPIView):
+class PetListCreateView(CursorPaginationMixin, generics.ListCreateAPIView):
     queryset = Pet.objects.filter(status='available')
     pagination_class = StandardResultsSetPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, PetSearchFilter]
     filterset_class = PetFilter
     search_fields = ['name', 'breed', 'description', 'personality_traits']
     ordering_fields = ['created_at', 'name', 'age_years', 'adoption_fee']
     ordering = ['-created_at']
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method == 'GET':
+            queryset = with_list_projection(queryset)
+        return queryset
+    
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return PetCreateUpdateSerializer
@@ -148,15 +238,49 @@ def toggle_favorite(request, pet_id):
         )
 
 
-class FavoritePetsView(generics.ListAPIView):
+class FavoritePetsView(CursorPaginationMixin, generics.ListAPIView):
     serializer_class = PetListSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = StandardResultsSetPagination
     
     def get_queryset(self):
-        return Pet.objects.filter(
+        return with_list_projection(Pet.objects.filter(
             favorited_by__user=self.request.user
-        ).order_by('-favorited_by__created_at')
+        )).annotate(
+            favorited_at=F('favorited_by__created_at')
+        ).order_by('-favorited_at')
+
+
+class SavedSearchListCreateView(generics.ListCreateAPIView):
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StandardResultsSetPagination
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
+    
+    def perform_create(self, serializer):
+        if self.request.user.user_type != 'adopter':
+            raise permissions.PermissionDenied("Only adopters can save searches")
+        serializer.save(user=self.request.user)
+
+
+class SavedSearchDetailView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user)
+
+
+class NotificationInboxView(generics.ListAPIView):
+    """The current user's notifications, newest first, by cursor"""
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CursorResultsSetPagination
+    
+    def get_queryset(self):
+        return inbox_queryset(self.request.user, self.request.query_params.get('unread') == '1')
 
 
 class AdoptionApplicationListCreateView(generics.ListCreateAPIView):
@@ -167,11 +291,12 @@ class AdoptionApplicationListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         user = self.request.user
         if user.user_type == 'adopter':
-            return AdoptionApplication.objects.filter(applicant=user)
+            queryset = AdoptionApplication.objects.filter(applicant=user)
         elif user.user_type == 'shelter':
-            return AdoptionApplication.objects.filter(pet__shelter=user)
+            queryset = AdoptionApplication.objects.filter(pet__shelter=user)
         else:  # admin
-            return AdoptionApplication.objects.all()
+            queryset = AdoptionApplication.objects.all()
+        return with_list_projection(queryset.select_related('applicant'), prefix='pet__')
     
     def perform_create(self, serializer):
         if self.request.user.user_type != 'adopter':
@@ -217,19 +342,25 @@ def update_application_status(request, application_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        now = timezone.now()
         application.status = new_status
         application.reviewer_notes = reviewer_notes
-        application.reviewed_at = timezone.now()
+        if new_status != 'completed' or application.reviewed_at is None:
+            # Completion is not a review; keep the decision's timestamp
+            application.reviewed_at = now
+        if new_status != 'rejected' and application.approved_at is None:
+            application.approved_at = now
         
         if new_status == 'completed':
-            application.completed_at = timezone.now()
-            application.pet.status = 'adopted'
-            application.pet.save()
-        elif new_status == 'approved':
-            application.pet.status = 'pending'
-            application.pet.save()
-        
-        application.save()
+            # Also notifies the pet's favoriters, as the HTML path does
+            application.complete(now)
+        else:
+            with transaction.atomic():
+                if new_status == 'approved':
+                    application.pet.status = 'pending'
+                    application.pet.save()
+                
+                application.save()
         
         return Response({
             'message': f'Application {new_status} successfully',
@@ -245,60 +376,183 @@ def update_application_status(request, application_id):
 
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
-def platform_stats(request):
-    """Get platform statistics"""
-    stats = {
-        'total_pets': Pet.objects.count(),
-        'available_pets': Pet.objects.filter(status='available').count(),
-        'adopted_pets': Pet.objects.filter(status='adopted').count(),
-        'pending_applications': AdoptionApplication.objects.filter(status='pending').count(),
-        'total_shelters': User.objects.filter(user_type='shelter').count(),
-        'total_adopters': User.objects.filter(user_type='adopter').count(),
-        'pets_by_species': list(
-            Pet.objects.values('species')
-            .annotate(count=Count('species'))
-            .order_by('-count')
-        ),
-        'recent_adoptions': list(
-            AdoptionApplication.objects.filter(status='completed')
-            .select_related('pet', 'applicant')
-            .order_by('-completed_at')[:5]
-            .values(
-                'pet__name', 'pet__species', 'applicant__first_name',
-                'completed_at'
-            )
+def pet_facets(request):
+    """Facet counts for the pet filter sidebar"""
+    filterset = PetSidebarFilter(
+        request.query_params,
+        queryset=Pet.objects.filter(status='available')
+    )
+    if not filterset.is_valid():
+        return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(get_facets(filterset))
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def pet_autocomplete(request):
+    """Typeahead suggestions for pet names, breeds and shelters"""
+    try:
+        limit = min(int(request.query_params.get('limit', 10)), 25)
+    except ValueError:
+        limit = 10
+    
+    kinds = AUTOCOMPLETE_KINDS
+    if request.query_params.get('type') in AUTOCOMPLETE_KINDS:
+        kinds = (request.query_params['type'],)
+    
+    suggestions = autocomplete_index.complete(
+        request.query_params.get('q', ''), limit=max(limit, 1), kinds=kinds
+    )
+    return Response({'suggestions': suggestions})
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def similar_pets(request, pk):
+    """Available pets most similar to the given pet"""
+    try:
+        pet = Pet.objects.get(pk=pk)
+    except Pet.DoesNotExist:
+        return Response(
+            {'error': 'Pet not found'},
+            status=status.HTTP_404_NOT_FOUND
         )
-    }
     
-    return Response(stats)
+    try:
+        limit = int(request.query_params.get('limit', SIMILAR_LIMIT))
+    except ValueError:
+        limit = SIMILAR_LIMIT
+    
+    pets = hydrate(find_similar_pets(pet, limit), with_list_projection(Pet.objects.all()))
+    serializer = PetListSerializer(pets, many=True, context={'request': request})
+    return Response({'results': serializer.data})
 
 
-@api_view(['POST'])
-@permission_classes([permissions.AllowAny])
-def search_pets(request):
-    """Advanced pet search"""
-    serializer = SearchSerializer(data=request.data)
-    serializer.is_valid(raise_exception=True)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def recommended_pets(request):
+    """Available pets best matching the adopter's profile"""
+    if request.user.user_type != 'adopter':
+        return Response(
+            {'error': 'Recommendations are only available to adopters'},
+            status=status.HTTP_403_FORBIDDEN
+        )
     
-    queryset = Pet.objects.filter(status='available')
+    try:
+        profile = request.user.adopter_profile
+    except AdopterProfile.DoesNotExist:
+        return Response(
+            {'error': 'Adopter profile not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
     
-    # Apply filters
-    filters = serializer.validated_data
+    try:
+        limit = int(request.query_params.get('limit', RECOMMENDATION_LIMIT))
+    except ValueError:
+        limit = RECOMMENDATION_LIMIT
+    
+    pets = hydrate(recommend_pets(profile, limit), with_list_projection(Pet.objects.all()))
+    serializer = PetListSerializer(pets, many=True, context={'request': request})
+    return Response({'results': serializer.data})
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def adoption_analytics(request):
+    """Adoption trends from the daily rollups"""
+    user = request.user
+    if user.user_type == 'shelter':
+        shelter_id = user.pk
+    elif user.user_type == 'admin':
+        shelter_id = request.query_params.get('shelter') or None
+        if shelter_id is not None:
+            try:
+                shelter_id = int(shelter_id)
+            except ValueError:
+                return Response(
+                    {'error': 'shelter must be a user ID'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+    else:
+        return Response(
+            {'error': 'Analytics are only available to shelters'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    end = timezone.localdate()
+    start = end - timedelta(days=89)
+    try:
+        if request.query_params.get('end'):
+            end = parse_date(request.query_params['end'])
+        if request.query_params.get('start'):
+            start = parse_date(request.query_params['start'])
+    except ValueError:
+        start = end = None
+    if start is None or end is None or start > end:
+        return Response(
+            {'error': 'Invalid date range'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    interval = request.query_params.get('interval', 'day')
+    if interval not in ANALYTICS_INTERVALS:
+        return Response(
+            {'error': f'interval must be one of {", ".join(ANALYTICS_INTERVALS)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    return Response(adoption_trends(
+        start, end, shelter_id=shelter_id,
+        species=request.query_params.get('species'), interval=interval
+    ))
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def platform_stats(request):
+    """Get platform statistics"""
+    stats = get_stats()
+    return Response({
+        field: stats[field] for field in (
+            'total_pets', 'available_pets', 'adopted_pets', 'pending_applications',
+            'total_shelters', 'total_adopters', 'pets_by_species', 'recent_adoptions'
+        )
+    })
+
+
+def _search_pet_ids(filters):
+    """Ordered IDs of the available pets matching the search filters"""
+    if filters.get('query') and filters.get('sort') == 'relevance':
+        # BM25F top-k ranking; structured filters only narrow the candidates
+        structured = {
+            name: value for name, value in filters.items()
+            if name not in ('query', 'sort') and value not in (None, '')
+        }
+        allowed = None
+        if set(structured) - {'radius_miles'}:
+            allowed = set(_search_pet_ids(structured))
+        return RankedResults(filters['query'], allowed)
+    
+    if catalog_enabled() and not filters.get('query') and not filters.get('near_zip'):
+        # Resolve the IDs in memory without touching the database
+        return catalog.filter_ids(criteria_from_search(filters))
+    
+    queryset = narrow_queryset(
+        Pet.objects.filter(status='available'),
+        dict(bitmap_predicates(filters), status='available')
+    )
     
     if filters.get('query'):
-        query = filters['query']
-        queryset = queryset.filter(
-            Q(name__icontains=query) |
-            Q(breed__icontains=query) |
-            Q(description__icontains=query) |
-            Q(personality_traits__icontains=query)
+        queryset = full_text_search(queryset, filters['query']).order_by(
+            '-search_rank', '-created_at'
         )
     
     if filters.get('species'):
         queryset = queryset.filter(species=filters['species'])
     
     if filters.get('breed'):
-        queryset = queryset.filter(breed__icontains=filters['breed'])
+        queryset = queryset.filter(breed_q(filters['breed'], filters.get('species')))
     
     if filters.get('size'):
         queryset = queryset.filter(size=filters['size'])
@@ -334,13 +588,58 @@ def search_pets(request):
             Q(shelter__state__icontains=location)
         )
     
-    # Paginate results
-    paginator = StandardResultsSetPagination()
-    page = paginator.paginate_queryset(queryset, request)
+    if filters.get('near_zip'):
+        # Radius search: shelters come from the geohash index, nearest first
+        distances = nearby_shelters(geocode(filters['near_zip']), filters['radius_miles'])
+        queryset = queryset.filter(shelter_id__in=list(distances)).annotate(
+            distance=Case(
+                *[When(shelter_id=pk, then=Value(miles)) for pk, miles in distances.items()],
+                output_field=FloatField()
+            )
+        ).order_by('distance', *(queryset.query.order_by or ['-created_at']))
     
-    if page is not None:
-        serializer = PetListSerializer(page, many=True, context={'request': request})
-        return paginator.get_paginated_response(serializer.data)
+    return queryset.values_list('pk', flat=True)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def search_pets(request):
+    """Advanced pet search"""
+    serializer = SearchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    filters = serializer.validated_data
+    
+    warnings = []
+    if filters.get('near_zip') and geocode(filters['near_zip']) is None:
+        # The centroid table may not know every ZIP; search without a radius
+        warnings.append(f"Unknown ZIP code {filters['near_zip']}; results are not limited by distance.")
+        filters = dict(filters, near_zip='')
     
-    serializer = PetListSerializer(queryset, many=True, context={'request': request})
-    return Response(serializer.data)
+    paginator = StandardResultsSetPagination()
+    page_size = paginator.get_page_size(request)
+    cache_key = search_cache_key(
+        filters, request.query_params.get(paginator.page_query_param, 1), page_size
+    )
+    
+    # Repeat searches reuse the cached page IDs and total count
+    result = cache.get(cache_key)
+    if result is None:
+        page_ids = paginator.paginate_queryset(_search_pet_ids(filters), request)
+        result = {
+            'ids': list(page_ids),
+            'count': paginator.page.paginator.count,
+            'number': paginator.page.number,
+        }
+        cache.set(cache_key, result, getattr(settings, 'PET_SEARCH_CACHE_TIMEOUT', 600))
+    else:
+        paginator.request = request
+        paginator.page = paginator.django_paginator_class(
+            range(result['count']), page_size
+        ).page(result['number'])
+    
+    pets = hydrate(result['ids'], with_list_projection(Pet.objects.all()))
+    serializer = PetListSerializer(pets, many=True, context={'request': request})
+    response = paginator.get_paginated_response(serializer.data)
+    if warnings:
+        response.data['warnings'] = warnings
+    return response
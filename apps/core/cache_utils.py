@@ -0,0 +1,53 @@
+"""
+Versioned cache namespaces
+
+Cached results embed the current version of the namespaces they depend on
+in their keys. Bumping a version orphans every key built from the previous
+one, which invalidates a whole family of entries in O(1).
+"""
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+def _version_key(namespace):
+    return f'cache_version:{namespace}'
+
+
+def get_version(namespace):
+    """Current version of ``namespace``"""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so an evicted counter never reuses old versions
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace):
+    """Invalidate every key built from the current version of ``namespace``"""
+    key = _version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = int(time.time() * 1000)
+        cache.set(key, version, None)
+        return version
+
+
+def fingerprint(data):
+    """Stable short hash of a JSON-serializable value"""
+    payload = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.md5(payload.encode()).hexdigest()
+
+
+def versioned_key(namespaces, *parts):
+    """Cache key tied to the current versions of one or more namespaces"""
+    if isinstance(namespaces, str):
+        namespaces = [namespaces]
+    versions = [f'{namespace}{get_version(namespace)}' for namespace in namespaces]
+    return ':'.join([*versions, *map(str, parts)])
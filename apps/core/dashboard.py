@@ -0,0 +1,111 @@
+"""
+Per-user dashboard snapshots
+
+Each dashboard's figures and "recent" lists are assembled once, from the
+status counters and single conditional aggregates, and cached under a
+namespace of their own. Signals bump the namespace of every user a change
+concerns: the owning shelter, the applicant and the admins. A dashboard
+load is then a single cache read, no matter how many animals a shelter has.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from apps.adoptions.models import AdoptionApplication
+from apps.pets.models import Pet
+from apps.users.models import User
+from .cache_utils import versioned_key
+from .counters import get_counts
+
+
+ADMIN_DASHBOARD_NAMESPACE = 'dashboard:admin'
+
+
+def dashboard_namespace(user_id):
+    return f'dashboard:{user_id}'
+
+
+def _shelter_snapshot(user):
+    pet_counts = get_counts('pet', shelter_id=user.pk)
+    application_counts = get_counts('application', shelter_id=user.pk)
+    return {
+        'total_pets': sum(pet_counts.values()),
+        'available_pets': pet_counts.get('available', 0),
+        'pending_pets': pet_counts.get('pending', 0),
+        'adopted_pets': pet_counts.get('adopted', 0),
+        'pending_applications': application_counts.get('pending', 0),
+        'approved_applications': application_counts.get('approved', 0),
+        'recent_pets': list(Pet.objects.filter(shelter=user).order_by('-created_at')[:5]),
+        'recent_applications': list(
+            AdoptionApplication.objects.filter(pet__shelter=user)
+            .select_related('pet', 'applicant')
+            .order_by('-submitted_at')[:5]
+        ),
+    }
+
+
+def _adopter_snapshot(user):
+    my_applications = AdoptionApplication.objects.filter(applicant=user)
+    counts = my_applications.aggregate(
+        total=Count('pk'),
+        pending=Count('pk', filter=Q(status='pending')),
+        approved=Count('pk', filter=Q(status='approved')),
+        completed=Count('pk', filter=Q(status='completed')),
+    )
+    return {
+        'total_applications': counts['total'],
+        'pending_applications': counts['pending'],
+        'approved_applications': counts['approved'],
+        'completed_adoptions': counts['completed'],
+        'recent_applications': list(
+            my_applications.select_related('pet').order_by('-submitted_at')[:5]
+        ),
+        'favorite_pets_count': user.favorite_pets.count(),
+    }
+
+
+def _admin_snapshot(user):
+    users = User.objects.aggregate(
+        total=Count('pk'),
+        shelters=Count('pk', filter=Q(user_type='shelter')),
+        adopters=Count('pk', filter=Q(user_type='adopter')),
+    )
+    pet_counts = get_counts('pet')
+    application_counts = get_counts('application')
+    return {
+        'total_users': users['total'],
+        'total_shelters': users['shelters'],
+        'total_adopters': users['adopters'],
+        'total_pets': sum(pet_counts.values()),
+        'available_pets': pet_counts.get('available', 0),
+        'adopted_pets': pet_counts.get('adopted', 0),
+        'total_applications': sum(application_counts.values()),
+        'pending_applications': application_counts.get('pending', 0),
+        'completed_adoptions': application_counts.get('completed', 0),
+        'recent_users': list(User.objects.order_by('-date_joined')[:5]),
+        'recent_pets': list(Pet.objects.select_related('shelter').order_by('-created_at')[:5]),
+    }
+
+
+SNAPSHOT_BUILDERS = {
+    'shelter': _shelter_snapshot,
+    'adopter': _adopter_snapshot,
+    'admin': _admin_snapshot,
+}
+
+
+def get_dashboard_snapshot(user):
+    """Cached dashboard figures for ``user``, or None for unknown user types"""
+    builder = SNAPSHOT_BUILDERS.get(user.user_type)
+    if builder is None:
+        return None
+
+    namespaces = [dashboard_namespace(user.pk)]
+    if user.user_type == 'admin':
+        namespaces.append(ADMIN_DASHBOARD_NAMESPACE)
+    key = versioned_key(namespaces, 'dashboard', user.pk)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = builder(user)
+        cache.set(key, snapshot, getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 300))
+    return snapshot
@@ -0,0 +1,137 @@
+"""
+Per-process in-memory indexes over database rows
+
+An index is built lazily on first use and remembers the version of the cache
+namespace it was built from. Changes made by this process are applied
+incrementally through ``publish_change``. A version bump by another worker
+is noticed on the next read.
+
+Answers that get cached (search results, facets, anonymous pages) are keyed
+by the namespace's current version, so they must come from an index built at
+that version; reads rebuild a stale index inline by default. Reads whose
+answers are never cached (autocomplete, recommendations, similar pets) pass
+``consistent=False`` and keep being served from the stale index while a
+background thread rebuilds a copy and swaps it in, at most once per
+``IN_MEMORY_INDEX_REBUILD_INTERVAL`` seconds.
+"""
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from .cache_utils import bump_version, get_version
+
+
+_registry = {}
+
+
+def register(index):
+    """Subscribe ``index`` to changes published on its namespace"""
+    _registry.setdefault(index.namespace, []).append(index)
+    return index
+
+
+def publish_change(namespace, instance, deleted=False):
+    """Bump ``namespace`` and let this process's indexes apply the change"""
+    version = bump_version(namespace)
+    for index in _registry.get(namespace, []):
+        index.notify(version, instance, deleted)
+    return version
+
+
+class InMemoryIndex:
+    namespace = None
+
+    # Bookkeeping kept when a rebuilt copy's data is swapped in
+    _OWN_STATE = ('_lock', '_version', '_built_at', '_refreshing')
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._version = None
+        self._built_at = 0.0
+        self._refreshing = False
+
+    @property
+    def is_built(self):
+        return self._version is not None
+
+    def build(self):
+        """
+        Load the whole index from the database.
+
+        Implementations assign fresh structures rather than mutating the
+        current ones, so a copy can be rebuilt while this one serves reads.
+        """
+        raise NotImplementedError
+
+    def upsert(self, instance):
+        raise NotImplementedError
+
+    def remove(self, pk):
+        raise NotImplementedError
+
+    def ensure_fresh(self, consistent=True):
+        """
+        Bring the index up to the namespace's current version.
+
+        With ``consistent=False`` a stale index is served as is while a copy
+        rebuilds in the background; only for answers that are never cached.
+        """
+        version = get_version(self.namespace)
+        with self._lock:
+            if self._version == version:
+                return
+            if self._version is None or consistent:
+                self.build()
+                self._version = version
+                self._built_at = time.monotonic()
+                return
+            interval = getattr(settings, 'IN_MEMORY_INDEX_REBUILD_INTERVAL', 5)
+            if self._refreshing or time.monotonic() - self._built_at < interval:
+                return
+            self._refreshing = True
+        threading.Thread(
+            target=self._refresh, name=f'{type(self).__name__}-refresh', daemon=True
+        ).start()
+
+    def _refresh(self):
+        """Rebuild a copy from the database and swap its data in"""
+        try:
+            version = get_version(self.namespace)
+            fresh = copy.copy(self)
+            fresh._lock = threading.RLock()
+            fresh.build()
+            with self._lock:
+                if self._version is not None and self._version >= version:
+                    # An inline build got there first
+                    return
+                for name, value in vars(fresh).items():
+                    if name not in self._OWN_STATE:
+                        setattr(self, name, value)
+                # Changes published while building are picked up by the next refresh
+                self._version = version
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._refreshing = False
+            connections.close_all()
+
+    def invalidate(self):
+        with self._lock:
+            self._version = None
+
+    def notify(self, version, instance, deleted=False):
+        with self._lock:
+            if not self.is_built:
+                return
+            # Apply in place only if ours is the single bump since the last
+            # build; otherwise stay stale until the next read rebuilds it
+            if version != self._version + 1:
+                return
+            if deleted:
+                self.remove(instance.pk)
+            else:
+                self.upsert(instance)
+            self._version = version
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.cache_utils import bump_version
+from apps.core.counters import reconcile
+from apps.core.stats import STATS_NAMESPACE
+
+
+class Command(BaseCommand):
+    help = 'Recount pets and adoption applications by status and repair drifted counters'
+
+    def handle(self, *args, **options):
+        corrected = reconcile()
+        if corrected:
+            bump_version(STATS_NAMESPACE)
+            self.stdout.write(self.style.WARNING(f'Corrected {corrected} status counters.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('All status counters are accurate.'))
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def populate_counters(apps, schema_editor):
+    Pet = apps.get_model('pets', 'Pet')
+    AdoptionApplication = apps.get_model('adoptions', 'AdoptionApplication')
+    StatusCounter = apps.get_model('core', 'StatusCounter')
+
+    totals = {}
+    sources = [
+        ('pet', Pet.objects.values('status', owner=F('shelter'))),
+        ('application', AdoptionApplication.objects.values('status', owner=F('pet__shelter'))),
+    ]
+    for entity, rows in sources:
+        for row in rows.annotate(count=Count('pk')).order_by():
+            for scope in ('global', f"shelter:{row['owner']}"):
+                key = (scope, entity, row['status'])
+                totals[key] = totals.get(key, 0) + row['count']
+
+    StatusCounter.objects.bulk_create([
+        StatusCounter(scope=scope, entity=entity, status=status, count=count)
+        for (scope, entity, status), count in totals.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        # Pet.shelter is added by pets' second initial migration
+        ('pets', '0002_initial'),
+        ('adoptions', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=32)),
+                ('entity', models.CharField(choices=[('pet', 'Pet'), ('application', 'Adoption Application')], max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('scope', 'entity', 'status')},
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class StatusCounter(models.Model):
+    """Running number of pets or applications in a status, globally or per shelter"""
+    ENTITY_CHOICES = [
+        ('pet', 'Pet'),
+        ('application', 'Adoption Application'),
+    ]
+    
+    # ``global`` or ``shelter:<id>``
+    scope = models.CharField(max_length=32)
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['scope', 'entity', 'status']
+    
+    def __str__(self):
+        return f"{self.scope} {self.entity} {self.status}: {self.count}"
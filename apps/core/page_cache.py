@@ -0,0 +1,83 @@
+"""
+Full-page cache for anonymous visitors
+
+Anonymous GET requests for a decorated view are answered from a cache
+entry keyed by the full path (URL and query string) and by the versions of
+the namespaces the page depends on. Responses carry ETag and Last-Modified
+headers, so repeat visitors get a 304 without a body. Authenticated users,
+requests with pending flash messages and responses that set cookies always
+bypass the cache. So do pages that used a CSRF token or touched the session.
+Their cookies are only added later by middleware, so the response alone
+doesn't show them, but the page would carry one visitor's token to everyone.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .cache_utils import fingerprint, versioned_key
+
+
+def _is_cacheable_request(request):
+    if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+        return False
+    # A flash message would be baked into the page for every visitor
+    if 'messages' in request.COOKIES:
+        return False
+    session = getattr(request, 'session', None)
+    return not (session and session.get('_messages'))
+
+
+def _sets_cookies_later(request):
+    """Whether middleware will attach a CSRF or session cookie to this response"""
+    if request.META.get('CSRF_COOKIE_NEEDS_UPDATE') or request.META.get('CSRF_COOKIE_USED'):
+        return True
+    session = getattr(request, 'session', None)
+    return bool(session and session.modified)
+
+
+def _build_response(entry):
+    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    patch_vary_headers(response, ['Cookie'])
+    return response
+
+
+def anonymous_page_cache(namespaces, timeout=None):
+    """Cache a view's rendered page for anonymous visitors"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if not _is_cacheable_request(request):
+                return view(request, *args, **kwargs)
+
+            key = versioned_key(namespaces, 'page', fingerprint(request.get_full_path()))
+            entry = cache.get(key)
+            if entry is None:
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render') and callable(response.render):
+                    response = response.render()
+                if (response.status_code != 200 or response.streaming or response.cookies
+                        or _sets_cookies_later(request)):
+                    return response
+                content = response.content
+                entry = {
+                    'content': content,
+                    'content_type': response['Content-Type'],
+                    'etag': f'"{hashlib.md5(content).hexdigest()}"',
+                    'last_modified': int(time.time()),
+                }
+                cache.set(key, entry, timeout or getattr(settings, 'ANONYMOUS_PAGE_CACHE_TIMEOUT', 300))
+
+            response = _build_response(entry)
+            return get_conditional_response(
+                request, etag=entry['etag'], last_modified=entry['last_modified'], response=response
+            )
+        return wrapped
+    return decorator
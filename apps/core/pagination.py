@@ -0,0 +1,235 @@
+"""
+Keyset (cursor) pagination shared by the API and HTML list views
+
+Instead of ``OFFSET`` plus ``COUNT(*)``, each page is fetched with a
+``WHERE (key) > (last key seen)`` condition on the ordering columns, so
+every page costs the same as the first one.
+"""
+import base64
+import datetime
+import json
+import math
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import EmptyPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    Keep datetimes and times at full precision. DjangoJSONEncoder cuts them to
+    milliseconds, which would skip rows sharing the boundary row's millisecond.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values, backwards=False, number=None):
+    data = {'k': values, 'b': int(backwards)}
+    if number is not None:
+        data['n'] = number
+    payload = json.dumps(data, cls=CursorEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _load_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return list(payload['k']), bool(payload.get('b')), int(payload.get('n', 1))
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise InvalidCursor(token)
+
+
+def decode_cursor(token):
+    values, backwards, _ = _load_cursor(token)
+    return values, backwards
+
+
+class KeysetPage:
+    """
+    A page of results plus the cursors pointing at its neighbours.
+
+    It also offers the ``django.core.paginator.Page`` API, so templates
+    written for numbered pages keep working. Page numbers travel in the
+    cursors, and a ``?page=`` link built from them lands on the same rows
+    through regular pagination.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, number=1, paginator=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.number = number
+        self.paginator = paginator
+
+    def __repr__(self):
+        return f'<Page {self.number} (keyset)>'
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        if not self.has_next():
+            raise EmptyPage('That page contains no results')
+        return self.number + 1
+
+    def previous_page_number(self):
+        if not self.has_previous():
+            raise EmptyPage('That page number is less than 1')
+        return self.number - 1
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by the values of its ordering columns.
+
+    ``ordering`` uses ``order_by`` syntax. The primary key is appended as a
+    tie-breaker so that every row has a unique position.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = [field for field in ordering if field.lstrip('-') not in ('pk', 'id')]
+        descending = self.ordering[0].startswith('-') if self.ordering else True
+        self.ordering.append('-id' if descending else 'id')
+
+    # Counting is what keyset pagination avoids; only templates asking for
+    # the page count pay for it
+
+    @cached_property
+    def count(self):
+        return self.queryset.count()
+
+    @cached_property
+    def num_pages(self):
+        return max(1, math.ceil(self.count / self.per_page))
+
+    @property
+    def page_range(self):
+        return range(1, self.num_pages + 1)
+
+    @staticmethod
+    def _split(field):
+        return field.lstrip('-'), field.startswith('-')
+
+    def _position_filter(self, values, backwards):
+        if len(values) != len(self.ordering):
+            raise InvalidCursor(values)
+
+        condition = Q()
+        equal_so_far = Q()
+        for field, value in zip(self.ordering, values):
+            name, descending = self._split(field)
+            lookup = 'lt' if descending != backwards else 'gt'
+            condition |= equal_so_far & Q(**{f'{name}__{lookup}': value})
+            equal_so_far &= Q(**{name: value})
+        return condition
+
+    def _key(self, obj):
+        return [getattr(obj, self._split(field)[0]) for field in self.ordering]
+
+    def page(self, cursor=None):
+        values, backwards, number = _load_cursor(cursor) if cursor else (None, False, 1)
+
+        ordering = self.ordering
+        if backwards:
+            ordering = [name if descending else f'-{name}'
+                        for name, descending in map(self._split, ordering)]
+
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            try:
+                queryset = queryset.filter(self._position_filter(values, backwards))
+            except (ValueError, TypeError) as exc:
+                raise InvalidCursor(cursor) from exc
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or backwards:
+                next_cursor = encode_cursor(self._key(rows[-1]), number=number + 1)
+            if (has_more and backwards) or (values is not None and not backwards):
+                previous_cursor = encode_cursor(self._key(rows[0]), backwards=True, number=max(number - 1, 1))
+
+        return KeysetPage(rows, next_cursor, previous_cursor, number, self)
+
+
+class KeysetPaginationMixin:
+    """
+    Let a ListView/FilterView switch to keyset pagination when the request
+    carries a ``cursor`` parameter (an empty value means the first page).
+
+    The keyset follows the page's effective ordering, with the primary key
+    as the tie-break. Orderings it cannot express (expressions, related or
+    nullable fields, random order) keep regular pagination.
+    """
+    cursor_param = 'cursor'
+
+    def get_keyset_ordering(self, queryset):
+        """The ordering columns to page by, or None to paginate regularly"""
+        ordering = list(queryset.query.order_by) or self.get_ordering() or queryset.model._meta.ordering
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        opts = queryset.model._meta
+        for field in ordering:
+            if not isinstance(field, str) or field == '?' or '__' in field:
+                return None
+            name = field.lstrip('-')
+            if name == 'pk':
+                continue
+            try:
+                if opts.get_field(name).null:
+                    # NULLs don't compare, so rows would drop out of the pages
+                    return None
+            except FieldDoesNotExist:
+                return None
+        return ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = self.get_keyset_ordering(queryset) if self.cursor_param in self.request.GET else None
+        if ordering is None:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, ordering, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_param) or None)
+        except InvalidCursor:
+            raise Http404('Invalid cursor')
+        return (paginator, page, page.object_list, page.has_other_pages())
@@ -0,0 +1,102 @@
+"""
+Signal handlers maintaining status counters and invalidating the cached
+platform statistics and dashboards
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.adoptions.models import AdoptionApplication
+from apps.pets.models import Pet, PetFavorite
+from apps.users.models import User
+from .cache_utils import bump_version
+from .counters import adjust, record_transition
+from .dashboard import ADMIN_DASHBOARD_NAMESPACE, dashboard_namespace
+from .stats import STATS_NAMESPACE
+
+
+def _invalidate_stats():
+    transaction.on_commit(lambda: bump_version(STATS_NAMESPACE))
+
+
+@receiver(post_save, sender=Pet)
+@receiver(post_save, sender=AdoptionApplication)
+def status_changed(sender, instance, created, **kwargs):
+    # ``_previous_status`` is recorded by the pets and adoptions pre_save handlers
+    if created or getattr(instance, '_previous_status', None) != instance.status:
+        _invalidate_stats()
+
+
+def _application_shelter_id(application):
+    if 'pet' in application._state.fields_cache:
+        return application.pet.shelter_id
+    return Pet.objects.filter(pk=application.pet_id).values_list('shelter_id', flat=True).first()
+
+
+# Counter updates run synchronously so they share the transaction of the save
+
+@receiver(post_save, sender=Pet)
+def count_pet_status(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_previous_status', None)
+    record_transition('pet', previous, instance.status, instance.shelter_id)
+
+
+@receiver(post_save, sender=AdoptionApplication)
+def count_application_status(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_previous_status', None)
+    if previous != instance.status:
+        record_transition('application', previous, instance.status, _application_shelter_id(instance))
+
+
+@receiver(post_delete, sender=Pet)
+def uncount_pet(sender, instance, **kwargs):
+    adjust('pet', instance.status, -1, instance.shelter_id)
+
+
+@receiver(post_delete, sender=AdoptionApplication)
+def uncount_application(sender, instance, **kwargs):
+    adjust('application', instance.status, -1, _application_shelter_id(instance))
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    if created:
+        _invalidate_stats()
+
+
+@receiver(post_delete, sender=Pet)
+@receiver(post_delete, sender=AdoptionApplication)
+@receiver(post_delete, sender=User)
+def row_deleted(sender, instance, **kwargs):
+    _invalidate_stats()
+
+
+def _invalidate_dashboards(*user_ids):
+    namespaces = [ADMIN_DASHBOARD_NAMESPACE]
+    namespaces += [dashboard_namespace(user_id) for user_id in user_ids if user_id]
+
+    def bump():
+        for namespace in namespaces:
+            bump_version(namespace)
+    transaction.on_commit(bump)
+
+
+@receiver([post_save, post_delete], sender=Pet)
+def pet_dashboards_changed(sender, instance, **kwargs):
+    _invalidate_dashboards(instance.shelter_id)
+
+
+@receiver([post_save, post_delete], sender=AdoptionApplication)
+def application_dashboards_changed(sender, instance, **kwargs):
+    _invalidate_dashboards(_application_shelter_id(instance), instance.applicant_id)
+
+
+@receiver([post_save, post_delete], sender=PetFavorite)
+def favorite_dashboards_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_version(dashboard_namespace(instance.user_id)))
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_dashboards_changed(sender, instance, **kwargs):
+    # Admins list recent users; a user's own name shows on their dashboard
+    _invalidate_dashboards(instance.pk)
@@ -0,0 +1,103 @@
+"""
+Platform statistics service
+
+Status counts come from the incrementally maintained counters and the
+breakdowns from one conditional aggregate per table; the result is cached
+under a versioned key. Pet, application and user signals bump the version
+when a status changes. On a miss a single worker takes a short lock and
+recomputes, while the others serve the previous snapshot (or wait briefly
+for the new one when there is none), so a burst of requests or a health
+check never stampedes the database.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from apps.adoptions.models import AdoptionApplication
+from apps.pets.models import Pet
+from apps.users.models import User
+from .cache_utils import versioned_key
+from .counters import get_counts
+
+
+STATS_NAMESPACE = 'platform_stats'
+
+STALE_KEY = 'platform_stats:last'
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 2.0
+WAIT_INTERVAL = 0.05
+
+
+def _by_choice(counts, prefix, field, choices):
+    """Non-zero ``{field: value, 'count': n}`` rows from the ``{prefix}_{value}`` aggregates"""
+    rows = [{field: value, 'count': counts[f'{prefix}_{value}']} for value, _ in choices]
+    return sorted([row for row in rows if row['count']], key=lambda row: -row['count'])
+
+
+def compute_stats():
+    """Uncached platform statistics"""
+    pet_counts = get_counts('pet')
+    application_counts = get_counts('application')
+    available = Q(status='available')
+    pets = Pet.objects.aggregate(
+        **{f'species_{value}': Count('pk', filter=Q(species=value)) for value, _ in Pet.SPECIES_CHOICES},
+        **{f'available_species_{value}': Count('pk', filter=available & Q(species=value))
+           for value, _ in Pet.SPECIES_CHOICES},
+        **{f'available_size_{value}': Count('pk', filter=available & Q(size=value))
+           for value, _ in Pet.SIZE_CHOICES},
+    )
+    users = User.objects.aggregate(
+        shelters=Count('pk', filter=Q(user_type='shelter')),
+        adopters=Count('pk', filter=Q(user_type='adopter')),
+    )
+    recent_adoptions = list(
+        AdoptionApplication.objects.filter(status='completed')
+        .order_by('-completed_at')[:5]
+        .values('pet__name', 'pet__species', 'applicant__first_name', 'completed_at')
+    )
+
+    return {
+        'total_pets': sum(pet_counts.values()),
+        'available_pets': pet_counts.get('available', 0),
+        'adopted_pets': pet_counts.get('adopted', 0),
+        'pending_applications': application_counts.get('pending', 0),
+        'completed_adoptions': application_counts.get('completed', 0),
+        'total_shelters': users['shelters'],
+        'total_adopters': users['adopters'],
+        'pets_by_species': _by_choice(pets, 'species', 'species', Pet.SPECIES_CHOICES),
+        'available_pets_by_species': _by_choice(pets, 'available_species', 'species', Pet.SPECIES_CHOICES),
+        'available_pets_by_size': _by_choice(pets, 'available_size', 'size', Pet.SIZE_CHOICES),
+        'recent_adoptions': recent_adoptions,
+    }
+
+
+def get_stats():
+    """Cached platform statistics, recomputed by at most one worker at a time"""
+    key = versioned_key(STATS_NAMESPACE, 'stats')
+    stats = cache.get(key)
+    if stats is not None:
+        return stats
+
+    lock_key = f'{key}:lock'
+    if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        stale = cache.get(STALE_KEY)
+        if stale is not None:
+            return stale
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_INTERVAL)
+            stats = cache.get(key)
+            if stats is not None:
+                return stats
+        # The lock holder is slow or gone; answer straight from the database
+        return compute_stats()
+
+    try:
+        stats = compute_stats()
+        cache.set(key, stats, getattr(settings, 'PLATFORM_STATS_CACHE_TIMEOUT', 60))
+        cache.set(STALE_KEY, stats, None)
+    finally:
+        cache.delete(lock_key)
+    return stats
@@ -0,0 +1,20 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.core import counters
+
+
+class RecordTransitionTests(TestCase):
+    @mock.patch('apps.core.counters.adjust')
+    def test_opposite_transitions_adjust_rows_in_the_same_order(self, adjust):
+        counters.record_transition('application', 'pending', 'approved', shelter_id=1)
+        counters.record_transition('application', 'approved', 'pending', shelter_id=1)
+        statuses = [call.args[1] for call in adjust.call_args_list]
+        self.assertEqual(statuses, ['approved', 'pending', 'approved', 'pending'])
+
+    def test_transition_moves_one_count(self):
+        counters.record_transition('pet', None, 'available', shelter_id=1)
+        counters.record_transition('pet', 'available', 'adopted', shelter_id=1)
+        self.assertEqual(counters.get_counts('pet', shelter_id=1), {'available': 0, 'adopted': 1})
+        self.assertEqual(counters.get_counts('pet'), {'available': 0, 'adopted': 1})
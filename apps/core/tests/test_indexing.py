@@ -0,0 +1,69 @@
+import threading
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.core.cache_utils import bump_version
+from apps.core.indexing import InMemoryIndex
+
+
+class CountingIndex(InMemoryIndex):
+    namespace = 'test_counting_index'
+
+    def __init__(self):
+        super().__init__()
+        self.builds = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def build(self):
+        self.release.wait(5)
+        self.builds += 1
+        self.rows = {'generation': self.builds}
+
+
+@override_settings(IN_MEMORY_INDEX_REBUILD_INTERVAL=0)
+class InMemoryIndexTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def wait_for_refresh(self):
+        for thread in threading.enumerate():
+            if thread.name == 'CountingIndex-refresh':
+                thread.join(5)
+
+    def test_first_build_is_inline(self):
+        index = CountingIndex()
+        index.ensure_fresh()
+        self.assertEqual(index.rows, {'generation': 1})
+
+    def test_stale_index_is_rebuilt_inline_by_default(self):
+        index = CountingIndex()
+        index.ensure_fresh()
+        bump_version(index.namespace)
+        index.ensure_fresh()
+        # Answers cached under the new version must not come from the old data
+        self.assertEqual(index.rows, {'generation': 2})
+
+    def test_stale_index_is_served_while_a_copy_rebuilds(self):
+        index = CountingIndex()
+        index.ensure_fresh()
+        bump_version(index.namespace)
+
+        index.release.clear()
+        index.ensure_fresh(consistent=False)
+        # The request returns at once with the old data
+        self.assertEqual(index.rows, {'generation': 1})
+        index.release.set()
+        self.wait_for_refresh()
+        self.assertEqual(index.rows, {'generation': 2})
+
+    @override_settings(IN_MEMORY_INDEX_REBUILD_INTERVAL=3600)
+    def test_rebuilds_are_debounced(self):
+        index = CountingIndex()
+        index.ensure_fresh()
+        for _ in range(3):
+            bump_version(index.namespace)
+            index.ensure_fresh(consistent=False)
+        self.wait_for_refresh()
+        self.assertEqual(index.rows, {'generation': 1})
@@ -0,0 +1,41 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, SimpleTestCase
+
+from apps.core.page_cache import anonymous_page_cache
+
+
+class AnonymousPageCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def request(self):
+        request = RequestFactory().get('/cached/')
+        request.user = AnonymousUser()
+        return request
+
+    def test_plain_page_is_served_from_cache(self):
+        @anonymous_page_cache(['test_pages'])
+        def view(request):
+            self.calls += 1
+            return HttpResponse('hello')
+
+        view(self.request())
+        response = view(self.request())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(response.content, b'hello')
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_page_using_a_csrf_token_is_never_cached(self):
+        @anonymous_page_cache(['test_pages'])
+        def view(request):
+            self.calls += 1
+            return HttpResponse(get_token(request))
+
+        first = view(self.request())
+        second = view(self.request())
+        self.assertEqual(self.calls, 2)
+        self.assertNotEqual(first.content, second.content)
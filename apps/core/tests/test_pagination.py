@@ -0,0 +1,92 @@
+import datetime
+
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils import timezone
+from django.views.generic import ListView
+
+from apps.core.pagination import KeysetPaginationMixin, KeysetPaginator, decode_cursor, encode_cursor
+from apps.notifications.models import Notification
+from apps.users.models import User
+
+
+class CursorEncodingTests(SimpleTestCase):
+    def test_datetimes_keep_microseconds(self):
+        value = datetime.datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=datetime.timezone.utc)
+        values, backwards = decode_cursor(encode_cursor([value, 7], backwards=True))
+        self.assertEqual(datetime.datetime.fromisoformat(values[0]), value)
+        self.assertEqual(values[1], 7)
+        self.assertTrue(backwards)
+
+
+class InboxView(KeysetPaginationMixin, ListView):
+    model = Notification
+
+
+class KeysetOrderingTests(SimpleTestCase):
+    def ordering(self, queryset, query=''):
+        view = InboxView()
+        view.setup(RequestFactory().get(f'/?cursor=&{query}'))
+        return view.get_keyset_ordering(queryset)
+
+    def test_follows_the_effective_ordering(self):
+        self.assertEqual(self.ordering(Notification.objects.all()), ['-created_at'])
+        self.assertEqual(self.ordering(Notification.objects.order_by('title', '-id')), ['title', '-id'])
+
+    def test_orderings_a_keyset_cannot_express_paginate_regularly(self):
+        self.assertIsNone(self.ordering(Notification.objects.order_by('sender__username')))
+        self.assertIsNone(self.ordering(Notification.objects.order_by('-read_at')))
+        self.assertIsNone(self.ordering(Notification.objects.order_by('?')))
+
+
+class KeysetPaginatorTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', password='x')
+        base = timezone.now().replace(microsecond=500000)
+        # Seven rows inside one millisecond, three of them on the exact same instant
+        offsets = [0, 0, 0, 101, 202, 303, 404]
+        for offset in offsets:
+            notification = Notification.objects.create(
+                recipient=self.user, notification_type='system_announcement',
+                title='t', message='m'
+            )
+            Notification.objects.filter(pk=notification.pk).update(
+                created_at=base + datetime.timedelta(microseconds=offset)
+            )
+
+    def walk(self, per_page):
+        paginator = KeysetPaginator(Notification.objects.filter(recipient=self.user), ['-created_at'], per_page)
+        seen = []
+        cursor = None
+        while True:
+            page = paginator.page(cursor)
+            seen.extend(notification.pk for notification in page)
+            if not page.has_next():
+                return seen, page
+            cursor = page.next_cursor
+
+    def test_pages_through_rows_sharing_a_millisecond(self):
+        expected = list(
+            Notification.objects.filter(recipient=self.user)
+            .order_by('-created_at', '-id').values_list('pk', flat=True)
+        )
+        for per_page in (1, 2, 3):
+            with self.subTest(per_page=per_page):
+                seen, _ = self.walk(per_page)
+                self.assertEqual(seen, expected)
+
+    def test_previous_cursor_returns_the_preceding_page(self):
+        paginator = KeysetPaginator(Notification.objects.filter(recipient=self.user), ['-created_at'], 2)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        back = paginator.page(second.previous_cursor)
+        self.assertEqual([n.pk for n in back], [n.pk for n in first])
+
+    def test_pages_offer_the_numbered_page_api(self):
+        paginator = KeysetPaginator(Notification.objects.filter(recipient=self.user), ['-created_at'], 3)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        self.assertEqual((first.number, second.number), (1, 2))
+        self.assertEqual((second.previous_page_number(), second.next_page_number()), (1, 3))
+        self.assertEqual((second.start_index(), second.end_index()), (4, 6))
+        self.assertEqual(paginator.num_pages, 3)
+        self.assertEqual(paginator.page(second.previous_cursor).number, 1)
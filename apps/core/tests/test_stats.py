@@ -0,0 +1,36 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIRequestFactory
+
+from apps.core.api_views import stats_api
+from apps.core.stats import _by_choice, get_stats
+
+
+class ByChoiceTests(SimpleTestCase):
+    def test_rows_are_keyed_by_the_field_not_the_aggregate_prefix(self):
+        counts = {'available_species_dog': 3, 'available_species_cat': 5, 'available_species_bird': 0}
+        choices = [('dog', 'Dog'), ('cat', 'Cat'), ('bird', 'Bird')]
+        self.assertEqual(
+            _by_choice(counts, 'available_species', 'species', choices),
+            [{'species': 'cat', 'count': 5}, {'species': 'dog', 'count': 3}]
+        )
+
+
+class StatsPayloadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_stats_api_keeps_its_public_shape(self):
+        response = stats_api(APIRequestFactory().get('/api/v1/stats/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {
+            'total_pets_available', 'total_pets_adopted', 'pending_applications',
+            'completed_adoptions', 'pets_by_species', 'pets_by_size',
+        })
+
+    def test_breakdown_rows_use_species_and_size_keys(self):
+        stats = get_stats()
+        for row in stats['pets_by_species'] + stats['available_pets_by_species']:
+            self.assertEqual(set(row), {'species', 'count'})
+        for row in stats['available_pets_by_size']:
+            self.assertEqual(set(row), {'size', 'count'})
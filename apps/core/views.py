@@ -1,30 +1,29 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Q
+from apps.pets.catalog import hydrate
+from apps.pets.featured import featured_pets
 from apps.pets.models import Pet
-from apps.adoptions.models import AdoptionApplication
-from apps.users.models import User
+from apps.pets.querysets import with_list_projection
+from apps.pets.recommendations import recommend_pets
+from apps.pets.signals import PETS_NAMESPACE, PET_IMAGES_NAMESPACE
+from apps.users.models import AdopterProfile
+from .dashboard import get_dashboard_snapshot
+from .page_cache import anonymous_page_cache
+from .stats import STATS_NAMESPACE, get_stats
 
 
+@anonymous_page_cache([PETS_NAMESPACE, PET_IMAGES_NAMESPACE, STATS_NAMESPACE])
 def home(request):
     """Home page view"""
-    # Get statistics for the home page
-    total_pets = Pet.objects.filter(status='available').count()
-    total_adopted = Pet.objects.filter(status='adopted').count()
-    pending_applications = AdoptionApplication.objects.filter(status='pending').count()
-
-    # Get featured pets (latest available pets)
-    featured_pets = Pet.objects.filter(status='available').select_related('shelter').prefetch_related('images')[:6]
-
-    # Get pets by species for statistics
-    pets_by_species = Pet.objects.filter(status='available').values('species').annotate(count=Count('species'))
+    # Statistics and the featured rotation are both precomputed
+    stats = get_stats()
 
     context = {
-        'total_pets': total_pets,
-        'total_adopted': total_adopted,
-        'pending_applications': pending_applications,
-        'featured_pets': featured_pets,
-        'pets_by_species': pets_by_species,
+        'total_pets': stats['available_pets'],
+        'total_adopted': stats['adopted_pets'],
+        'pending_applications': stats['pending_applications'],
+        'featured_pets': featured_pets(),
+        'pets_by_species': stats['available_pets_by_species'],
     }
 
     return render(request, 'core/home.html', context)
@@ -36,55 +35,24 @@ def dashboard(request):
     user = request.user
     context = {'user': user}
 
+    snapshot = get_dashboard_snapshot(user)
+    if snapshot is not None:
+        context.update(snapshot)
+
     if user.user_type == 'shelter':
-        # Shelter dashboard statistics
-        my_pets = Pet.objects.filter(shelter=user)
-        context.update({
-            'total_pets': my_pets.count(),
-            'available_pets': my_pets.filter(status='available').count(),
-            'pending_pets': my_pets.filter(status='pending').count(),
-            'adopted_pets': my_pets.filter(status='adopted').count(),
-            'pending_applications': AdoptionApplication.objects.filter(
-                pet__shelter=user, status='pending'
-            ).count(),
-            'approved_applications': AdoptionApplication.objects.filter(
-                pet__shelter=user, status='approved'
-            ).count(),
-            'recent_pets': my_pets.order_by('-created_at')[:5],
-            'recent_applications': AdoptionApplication.objects.filter(
-                pet__shelter=user
-            ).order_by('-submitted_at')[:5],
-        })
         return render(request, 'core/shelter_dashboard.html', context)
 
     elif user.user_type == 'adopter':
-        # Adopter dashboard statistics
-        my_applications = AdoptionApplication.objects.filter(applicant=user)
-        context.update({
-            'total_applications': my_applications.count(),
-            'pending_applications': my_applications.filter(status='pending').count(),
-            'approved_applications': my_applications.filter(status='approved').count(),
-            'completed_adoptions': my_applications.filter(status='completed').count(),
-            'recent_applications': my_applications.order_by('-submitted_at')[:5],
-            'favorite_pets_count': user.favorite_pets.count(),
-        })
+        try:
+            context['recommended_pets'] = hydrate(
+                recommend_pets(user.adopter_profile, 6),
+                with_list_projection(Pet.objects.all())
+            )
+        except AdopterProfile.DoesNotExist:
+            context['recommended_pets'] = []
         return render(request, 'core/adopter_dashboard.html', context)
 
     elif user.user_type == 'admin':
-        # Admin dashboard statistics
-        context.update({
-            'total_users': User.objects.count(),
-            'total_shelters': User.objects.filter(user_type='shelter').count(),
-            'total_adopters': User.objects.filter(user_type='adopter').count(),
-            'total_pets': Pet.objects.count(),
-            'available_pets': Pet.objects.filter(status='available').count(),
-            'adopted_pets': Pet.objects.filter(status='adopted').count(),
-            'total_applications': AdoptionApplication.objects.count(),
-            'pending_applications': AdoptionApplication.objects.filter(status='pending').count(),
-            'completed_adoptions': AdoptionApplication.objects.filter(status='completed').count(),
-            'recent_users': User.objects.order_by('-date_joined')[:5],
-            'recent_pets': Pet.objects.order_by('-created_at')[:5],
-        })
         return render(request, 'core/admin_dashboard.html', context)
 
     # Default redirect to home
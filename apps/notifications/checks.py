@@ -0,0 +1,25 @@
+"""
+System checks for the notifications app
+"""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def shared_cache_check(app_configs, **kwargs):
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if backend not in PER_PROCESS_CACHES:
+        return []
+    return [Warning(
+        'The default cache is not shared between processes.',
+        hint=(
+            'Fan-out progress and unread counters are kept in the default cache; '
+            'with several workers configure a shared backend such as Redis.'
+        ),
+        id='notifications.W001',
+    )]
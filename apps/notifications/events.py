@@ -0,0 +1,56 @@
+"""
+Live notification events pushed to connected clients
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .pubsub import publish
+from .unread import adjust_unread_count, get_unread_count
+
+
+def notification_payload(notification):
+    return {
+        'id': notification.pk,
+        'type': notification.notification_type,
+        'title': notification.title,
+        'message': notification.message,
+        'pet_id': notification.pet_id,
+        'is_important': notification.is_important,
+        'created_at': notification.created_at,
+    }
+
+
+def unread_count(user_id):
+    return get_unread_count(user_id)
+
+
+def format_event(event, data, event_id=None):
+    """Encode one Server-Sent Events frame"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, cls=DjangoJSONEncoder)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def push_unread_count(user_id):
+    publish(user_id, {'event': 'unread_count', 'data': {'unread_count': unread_count(user_id)}})
+
+
+def push_notifications(notifications):
+    """Count new notifications as unread and publish them, then each recipient's unread count once"""
+    recipients = []
+    for notification in notifications:
+        # Closes the change opened before the notification was written
+        adjust_unread_count(notification.recipient_id, 0 if notification.is_read else 1)
+        publish(notification.recipient_id, {
+            'event': 'notification',
+            'id': notification.pk,
+            'data': notification_payload(notification),
+        })
+        if notification.recipient_id not in recipients:
+            recipients.append(notification.recipient_id)
+    for user_id in recipients:
+        push_unread_count(user_id)
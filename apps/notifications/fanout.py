@@ -0,0 +1,177 @@
+"""
+Bulk notification fan-out
+
+Broadcast notifications (a favourited pet being adopted, system
+announcements) go to recipients resolved by a single ``values_list`` query
+instead of one ``create`` per user. ``start_fanout`` hands the job to a small
+worker pool once the triggering transaction commits, so the request returns
+immediately. The worker writes the rows in chunks with ``bulk_create``, moves
+the unread counters, pushes live events and records its progress in the cache
+under the returned job ID.
+
+Jobs live in the memory of the web worker that queued them. A worker that
+restarts or is recycled loses its queued and running jobs. Their progress
+stops moving, and after ``NOTIFICATION_FANOUT_STALE_AFTER`` seconds without a
+heartbeat it is reported as failed. Progress is only visible across workers
+with a shared cache backend (e.g. Redis), which the ``notifications.W001``
+check asks for.
+
+``run_in_background`` puts other notification work that must not hold up or
+fail a request, such as saved search alerts, on the same pool.
+"""
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from apps.pets.models import PetFavorite
+from apps.users.models import User
+from .events import push_notifications
+from .models import Notification
+from .unread import begin_unread_change
+
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_TIMEOUT = 24 * 60 * 60
+
+UNFINISHED = ('queued', 'running')
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'NOTIFICATION_FANOUT_WORKERS', 2),
+    thread_name_prefix='notification-fanout'
+)
+
+
+def _progress_key(job_id):
+    return f'notifications:fanout:{job_id}'
+
+
+def _chunk_size():
+    return getattr(settings, 'NOTIFICATION_FANOUT_CHUNK_SIZE', 500)
+
+
+def get_progress(job_id):
+    """Progress of a fan-out job, or None once it has expired"""
+    progress = cache.get(_progress_key(job_id))
+    stale_after = getattr(settings, 'NOTIFICATION_FANOUT_STALE_AFTER', 10 * 60)
+    if (progress is not None and progress.get('status') in UNFINISHED
+            and time.time() - progress.get('heartbeat', 0) > stale_after):
+        # The worker holding the job went away
+        _set_progress(job_id, progress, status='failed', error='Worker stopped before the job finished')
+    return progress
+
+
+def _set_progress(job_id, progress, **changes):
+    progress.update(changes, updated_at=timezone.now().isoformat(), heartbeat=time.time())
+    cache.set(_progress_key(job_id), progress, PROGRESS_TIMEOUT)
+
+
+def deliver(job_id, recipient_ids, fields):
+    """Write one notification built from ``fields`` per recipient, chunk by chunk"""
+    progress = cache.get(_progress_key(job_id)) or {}
+    recipients = list(recipient_ids)
+    _set_progress(job_id, progress, status='running', total=len(recipients), sent=0)
+    chunk_size = _chunk_size()
+    sent = 0
+    try:
+        for start in range(0, len(recipients), chunk_size):
+            chunk = recipients[start:start + chunk_size]
+            for recipient_id in chunk:
+                begin_unread_change(recipient_id)
+            notifications = Notification.objects.bulk_create([
+                Notification(recipient_id=recipient_id, **fields) for recipient_id in chunk
+            ])
+            # bulk_create bypasses post_save, so counters and streams are fed here
+            push_notifications(notifications)
+            sent += len(notifications)
+            _set_progress(job_id, progress, sent=sent)
+    except Exception as exc:
+        _set_progress(job_id, progress, status='failed', error=str(exc))
+        raise
+    _set_progress(job_id, progress, status='completed')
+    return sent
+
+
+def _run(job_id, recipient_ids, fields):
+    try:
+        deliver(job_id, recipient_ids, fields)
+    finally:
+        # Worker threads open their own connections; don't leak them
+        close_old_connections()
+
+
+def _run_logged(func, args):
+    try:
+        func(*args)
+    except Exception:
+        logger.exception('Background notification job %s failed', func.__name__)
+    finally:
+        close_old_connections()
+
+
+def run_in_background(func, *args):
+    """Run ``func(*args)`` on the fan-out pool, logging its errors instead of raising them"""
+    _executor.submit(_run_logged, func, args)
+
+
+def start_fanout(recipient_ids, **fields):
+    """
+    Queue a fan-out job and return its ID.
+
+    ``recipient_ids`` is evaluated on the worker, so pass the lazy queryset.
+    The job starts after the current transaction commits.
+    """
+    job_id = uuid.uuid4().hex
+    _set_progress(
+        job_id, {'sender_id': fields.get('sender_id')},
+        status='queued', notification_type=fields['notification_type'], total=None, sent=0
+    )
+    transaction.on_commit(lambda: _executor.submit(_run, job_id, recipient_ids, fields))
+    return job_id
+
+
+def notify_favoriters_adopted(application):
+    """Tell everyone who favourited the pet, except its new owner, that it was adopted"""
+    pet = application.pet
+    recipient_ids = PetFavorite.objects.filter(pet=pet).exclude(
+        user=application.applicant_id
+    ).values_list('user_id', flat=True)
+    return start_fanout(
+        recipient_ids,
+        sender_id=pet.shelter_id,
+        notification_type='favorite_pet_adopted',
+        title=f'{pet.name} has been adopted',
+        message=f'{pet.name}, one of your favorites, has found a home. Thank you for caring!',
+        pet_id=pet.pk,
+    )
+
+
+def announcement_recipients(user_type=None):
+    recipient_ids = User.objects.filter(is_active=True)
+    if user_type:
+        recipient_ids = recipient_ids.filter(user_type=user_type)
+    return recipient_ids.values_list('pk', flat=True)
+
+
+def announcement_fields(title, message, sender=None, is_important=False):
+    return {
+        'sender_id': sender.pk if sender else None,
+        'notification_type': 'system_announcement',
+        'title': title,
+        'message': message,
+        'is_important': is_important,
+    }
+
+
+def announce(title, message, sender=None, user_type=None, is_important=False):
+    """Send a system announcement to every active user (optionally of one type)"""
+    return start_fanout(
+        announcement_recipients(user_type),
+        **announcement_fields(title, message, sender, is_important)
+    )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.notifications.unread import reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = 'Rewrite the cached unread notification counters from the database (schedule every ~15 minutes)'
+
+    def handle(self, *args, **options):
+        written = reconcile_unread_counts()
+        self.stdout.write(self.style.SUCCESS(f'Reconciled unread counts for {written} users.'))
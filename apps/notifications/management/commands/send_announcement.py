@@ -0,0 +1,27 @@
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications.fanout import announcement_fields, announcement_recipients, deliver, get_progress
+
+
+class Command(BaseCommand):
+    help = 'Send a system announcement notification to every active user'
+
+    def add_arguments(self, parser):
+        parser.add_argument('title')
+        parser.add_argument('message')
+        parser.add_argument('--user-type', choices=['adopter', 'shelter', 'admin'], help='Only notify users of this type')
+        parser.add_argument('--important', action='store_true', help='Flag the announcement as important')
+
+    def handle(self, *args, **options):
+        # Delivered inline: a management command has no request to unblock
+        job_id = uuid.uuid4().hex
+        sent = deliver(
+            job_id,
+            announcement_recipients(options['user_type']),
+            announcement_fields(options['title'], options['message'], is_important=options['important'])
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {sent} announcements (job {job_id}, {get_progress(job_id)['status']})."
+        ))
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('adoptions', '0002_initial'),
+        ('pets', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_type', models.CharField(choices=[('adoption_request', 'Adoption Request'), ('application_approved', 'Application Approved'), ('application_rejected', 'Application Rejected'), ('new_pet_added', 'New Pet Added'), ('adoption_completed', 'Adoption Completed'), ('interview_scheduled', 'Interview Scheduled'), ('favorite_pet_adopted', 'Favorite Pet Adopted'), ('system_announcement', 'System Announcement')], max_length=30)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('is_read', models.BooleanField(default=False)),
+                ('is_important', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('adoption_application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='adoptions.adoptionapplication')),
+                ('pet', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='pets.pet')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+                ('sender', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sent_notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AdoptionRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('withdrawn', 'Withdrawn')], default='pending', max_length=20)),
+                ('message', models.TextField(help_text='Brief message about why you want to adopt this pet')),
+                ('phone_number', models.CharField(help_text='Contact phone number', max_length=15)),
+                ('preferred_contact_time', models.CharField(blank=True, help_text='Best time to contact you', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('shelter_response', models.TextField(blank=True)),
+                ('responded_at', models.DateTimeField(blank=True, null=True)),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adoption_requests', to='pets.pet')),
+                ('requester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adoption_requests', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'unique_together': {('requester', 'pet')},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('filters', models.JSONField(default=dict, help_text='SearchSerializer-shaped query')),
+                ('is_active', models.BooleanField(default=True)),
+                ('species', models.CharField(blank=True, max_length=20)),
+                ('size', models.CharField(blank=True, max_length=20)),
+                ('good_with_kids', models.BooleanField(blank=True, null=True)),
+                ('good_with_dogs', models.BooleanField(blank=True, null=True)),
+                ('good_with_cats', models.BooleanField(blank=True, null=True)),
+                ('house_trained', models.BooleanField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_notified_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['species', 'size', 'is_active'], name='notif_savedsearch_match_idx')],
+            },
+        ),
+    ]
@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
+from django.utils import timezone
 from apps.users.models import User
 from apps.pets.models import Pet
 from apps.adoptions.models import AdoptionApplication
@@ -37,15 +38,75 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Inbox pages: one range scan in keyset order, no sort
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notif_inbox_idx'),
+            models.Index(fields=['recipient', 'is_read', '-created_at', '-id'], name='notif_inbox_unread_idx'),
+            # Unread counts read only this small partial index
+            models.Index(fields=['recipient'], condition=models.Q(is_read=False), name='notif_unread_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.recipient.username}"
     
     def mark_as_read(self):
-        if not self.is_read:
-            self.is_read = True
-            self.read_at = timezone.now()
-            self.save()
+        if self.is_read:
+            return
+        # Imported here: the counter modules import this one
+        from .events import push_unread_count
+        from .unread import adjust_unread_count, begin_unread_change
+        
+        begin_unread_change(self.recipient_id)
+        read_at = timezone.now()
+        # Conditional so that concurrent calls only count the row once
+        marked = Notification.objects.filter(pk=self.pk, is_read=False).update(is_read=True, read_at=read_at)
+        self.is_read = True
+        recipient_id = self.recipient_id
+        if not marked:
+            # Another request got there first and counted it
+            adjust_unread_count(recipient_id, 0)
+            return
+        self.read_at = read_at
+        transaction.on_commit(lambda: adjust_unread_count(recipient_id, -1))
+        transaction.on_commit(lambda: push_unread_count(recipient_id))
+
+
+class SavedSearch(models.Model):
+    """A pet search an adopter wants to be alerted about"""
+    FLAG_FIELDS = ['good_with_kids', 'good_with_dogs', 'good_with_cats', 'house_trained']
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=100, blank=True)
+    filters = models.JSONField(default=dict, help_text="SearchSerializer-shaped query")
+    is_active = models.BooleanField(default=True)
+    
+    # Denormalized from ``filters`` as the reverse index used to find the
+    # searches a new pet could match; blank/null means "any"
+    species = models.CharField(max_length=20, blank=True)
+    size = models.CharField(max_length=20, blank=True)
+    good_with_kids = models.BooleanField(null=True, blank=True)
+    good_with_dogs = models.BooleanField(null=True, blank=True)
+    good_with_cats = models.BooleanField(null=True, blank=True)
+    house_trained = models.BooleanField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_notified_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['species', 'size', 'is_active'], name='notif_savedsearch_match_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name or 'Saved search'} - {self.user.username}"
+    
+    def save(self, *args, **kwargs):
+        self.species = self.filters.get('species') or ''
+        self.size = self.filters.get('size') or ''
+        for flag in self.FLAG_FIELDS:
+            setattr(self, flag, self.filters.get(flag))
+        super().save(*args, **kwargs)
 
 
 class AdoptionRequest(models.Model):
@@ -0,0 +1,155 @@
+"""
+In-process publish/subscribe for live notification delivery
+
+Each worker keeps a hub of per-user subscriber queues, fed by its streaming
+responses. Publishing goes through a pluggable backend chosen by the
+``NOTIFICATION_PUBSUB_BACKEND`` setting. The backend delivers every
+message to the hub of each worker that has subscribers.
+
+``LocalPubSubBackend`` (the default) only reaches streams held by the worker
+that published, so it is only correct for a single process: with three
+gunicorn workers about two thirds of open streams miss a live event and only
+catch up on their next reconnect. Multi-process deployments should use
+``RedisPubSubBackend``, which relays every message through one Redis channel
+to a listener thread in each worker.
+"""
+import json
+import os
+import queue
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+
+# Messages buffered per subscriber before the oldest are dropped
+SUBSCRIBER_BUFFER = 100
+
+
+class Subscription:
+    def __init__(self, hub, user_id):
+        self.hub = hub
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_BUFFER)
+
+    def put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            # A stalled client loses its oldest message rather than blocking publishers
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(message)
+
+    def get(self, timeout):
+        """Next message, or None after ``timeout`` seconds"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Hub:
+    """This worker's subscribers, by user ID"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, user_id):
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def dispatch(self, user_id, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+
+
+class LocalPubSubBackend:
+    """Delivers to this worker's hub only"""
+
+    def __init__(self, hub):
+        self.hub = hub
+
+    def publish(self, user_id, message):
+        self.hub.dispatch(user_id, message)
+
+
+class RedisPubSubBackend:
+    """Relays messages to the hubs of every worker through a Redis channel"""
+    channel = 'notifications:live'
+
+    def __init__(self, hub):
+        if redis is None:
+            raise ImproperlyConfigured('RedisPubSubBackend requires the redis package')
+        self.hub = hub
+        url = getattr(settings, 'NOTIFICATION_PUBSUB_URL', None) or os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+        self.client = redis.Redis.from_url(url)
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.channel: self._on_message})
+        self._listener = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def _on_message(self, message):
+        payload = json.loads(message['data'])
+        self.hub.dispatch(payload['user_id'], payload['message'])
+
+    def publish(self, user_id, message):
+        self.client.publish(self.channel, json.dumps({'user_id': user_id, 'message': message}, cls=DjangoJSONEncoder))
+
+
+hub = Hub()
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            path = getattr(
+                settings, 'NOTIFICATION_PUBSUB_BACKEND',
+                'apps.notifications.pubsub.LocalPubSubBackend'
+            )
+            _backend = import_string(path)(hub)
+        return _backend
+
+
+def publish(user_id, message):
+    """Send ``message`` (a JSON-serializable dict) to every live stream of ``user_id``"""
+    get_backend().publish(user_id, message)
+
+
+def subscribe(user_id):
+    get_backend()
+    return hub.subscribe(user_id)
@@ -0,0 +1,12 @@
+"""
+Query helpers for the notification inbox
+"""
+from .models import Notification
+
+
+def inbox_queryset(user, unread_only=False):
+    """A user's notifications in inbox order, with sender and pet loaded"""
+    notifications = Notification.objects.filter(recipient=user)
+    if unread_only:
+        notifications = notifications.filter(is_read=False)
+    return notifications.select_related('sender', 'pet')
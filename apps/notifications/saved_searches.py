@@ -0,0 +1,113 @@
+"""
+Matching newly listed pets against adopters' saved searches
+
+Saved searches carry their species, size and flag predicates as indexed
+columns, so a new pet first selects only the searches it could satisfy
+(blank/null columns match anything). The remaining predicates of those few
+candidates are checked in Python, and every matching adopter gets one
+``new_pet_added`` notification through a single bulk insert.
+"""
+from decimal import Decimal
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from apps.pets.fuzzy import breed_matches
+from apps.pets.search import SEARCH_FIELDS, tokenize
+from apps.users.geo import geocode, haversine_miles
+from .events import push_notifications
+from .models import Notification, SavedSearch
+from .unread import begin_unread_change
+
+
+TITLE_MAX_LENGTH = Notification._meta.get_field('title').max_length
+
+
+def candidate_searches(pet):
+    """Active saved searches whose indexed predicates ``pet`` satisfies"""
+    condition = (
+        Q(species='') | Q(species=pet.species)
+    ) & (
+        Q(size='') | Q(size=pet.size)
+    )
+    for flag in SavedSearch.FLAG_FIELDS:
+        if not getattr(pet, flag):
+            # A pet without the trait only satisfies searches not asking for it
+            condition &= Q(**{f'{flag}__isnull': True}) | Q(**{flag: False})
+    return SavedSearch.objects.filter(condition, is_active=True).exclude(user=pet.shelter_id)
+
+
+def matches(filters, pet):
+    """Whether ``pet`` satisfies the predicates not covered by the reverse index"""
+    if filters.get('gender') and pet.gender != filters['gender']:
+        return False
+    if filters.get('age_min') is not None and pet.age_years < filters['age_min']:
+        return False
+    if filters.get('age_max') is not None and pet.age_years > filters['age_max']:
+        return False
+    if filters.get('max_fee') not in (None, '') and pet.adoption_fee > Decimal(str(filters['max_fee'])):
+        return False
+    for flag in SavedSearch.FLAG_FIELDS:
+        # Searches asking for a trait to be absent are not indexed on it
+        if filters.get(flag) is False and getattr(pet, flag):
+            return False
+
+    if filters.get('breed') and not breed_matches(pet.breed, filters['breed'], pet.species):
+        return False
+
+    if filters.get('location'):
+        location = filters['location'].lower()
+        if location not in pet.shelter.city.lower() and location not in pet.shelter.state.lower():
+            return False
+
+    center = geocode(filters['near_zip']) if filters.get('near_zip') else None
+    if center is not None:
+        # An unknown ZIP doesn't limit the search, as in the search API
+        if pet.shelter.latitude is None:
+            return False
+        distance = haversine_miles(center, (pet.shelter.latitude, pet.shelter.longitude))
+        if distance > float(filters.get('radius_miles') or 25):
+            return False
+
+    if filters.get('query'):
+        words = set()
+        for field in SEARCH_FIELDS:
+            words.update(tokenize(getattr(pet, field)))
+        # Same semantics as the full-text index: every token, as a prefix
+        for token in tokenize(filters['query']):
+            if not any(word.startswith(token) for word in words):
+                return False
+
+    return True
+
+
+def notify_saved_searches(pet):
+    """Notify every adopter with a saved search matching ``pet``; returns the count"""
+    matched = {}
+    for saved_search in candidate_searches(pet).only('pk', 'user_id', 'name', 'filters'):
+        if saved_search.user_id not in matched and matches(saved_search.filters, pet):
+            matched[saved_search.user_id] = saved_search
+
+    notifications = [
+        Notification(
+            recipient_id=user_id,
+            sender_id=pet.shelter_id,
+            notification_type='new_pet_added',
+            title=Truncator(
+                f'New match for {saved_search.name or "your saved search"}: {pet.name}'
+            ).chars(TITLE_MAX_LENGTH),
+            message=f'{pet.name}, a {pet.breed} {pet.get_species_display().lower()}, was just listed and matches your saved search.',
+            pet=pet,
+        )
+        for user_id, saved_search in matched.items()
+    ]
+    for user_id in matched:
+        begin_unread_change(user_id)
+    Notification.objects.bulk_create(notifications, batch_size=500)
+    # bulk_create bypasses post_save, so live streams are fed here
+    push_notifications(notifications)
+    SavedSearch.objects.filter(pk__in=[s.pk for s in matched.values()]).update(
+        last_notified_at=timezone.now()
+    )
+    return len(notifications)
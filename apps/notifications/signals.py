@@ -0,0 +1,49 @@
+"""
+Signal handlers emitting notifications for pet catalog changes and pushing
+notification changes to live streams
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.pets.models import Pet
+from .events import push_notifications, push_unread_count
+from .fanout import run_in_background
+from .models import Notification
+from .saved_searches import notify_saved_searches
+from .unread import adjust_unread_count, begin_unread_change, reset_unread_count
+
+
+@receiver(post_save, sender=Pet)
+def pet_listed(sender, instance, created, **kwargs):
+    if instance.status != 'available':
+        return
+    # Newly created, or back on the market after a pending/withdrawn adoption
+    if created or getattr(instance, '_previous_status', 'available') != 'available':
+        # Off the request, so one adopter's alert can never fail the shelter's save
+        transaction.on_commit(lambda: run_in_background(notify_saved_searches, instance))
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, update_fields=None, **kwargs):
+    user_id = instance.recipient_id
+    if created:
+        begin_unread_change(user_id)
+        transaction.on_commit(lambda: push_notifications([instance]))
+        return
+    if update_fields is not None and 'is_read' not in update_fields:
+        return
+    # The transition is unknown (mark_as_read doesn't save); reseed on next read
+    begin_unread_change(user_id)
+    transaction.on_commit(lambda: reset_unread_count(user_id))
+    transaction.on_commit(lambda: push_unread_count(user_id))
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    if instance.is_read:
+        return
+    user_id = instance.recipient_id
+    begin_unread_change(user_id)
+    transaction.on_commit(lambda: adjust_unread_count(user_id, -1))
+    transaction.on_commit(lambda: push_unread_count(user_id))
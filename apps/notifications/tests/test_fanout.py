@@ -0,0 +1,30 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.notifications.fanout import _progress_key, deliver, get_progress
+from apps.notifications.models import Notification
+from apps.users.models import User
+
+
+class FanoutTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(username=f'user{index}', password='x') for index in range(5)]
+
+    def test_deliver_writes_in_chunks_and_reports_progress(self):
+        with self.settings(NOTIFICATION_FANOUT_CHUNK_SIZE=2):
+            sent = deliver('job', [user.pk for user in self.users], {
+                'notification_type': 'system_announcement', 'title': 'Hello', 'message': 'World',
+            })
+        self.assertEqual(sent, 5)
+        self.assertEqual(Notification.objects.filter(title='Hello').count(), 5)
+        progress = get_progress('job')
+        self.assertEqual((progress['status'], progress['total'], progress['sent']), ('completed', 5, 5))
+
+    def test_job_without_a_heartbeat_is_reported_failed(self):
+        cache.set(_progress_key('lost'), {'status': 'running', 'sent': 2, 'heartbeat': time.time()})
+        with mock.patch('apps.notifications.fanout.time.time', return_value=time.time() + 3600):
+            self.assertEqual(get_progress('lost')['status'], 'failed')
@@ -0,0 +1,36 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.notifications.fanout import _run_logged
+from apps.notifications.models import Notification, SavedSearch
+from apps.notifications.saved_searches import notify_saved_searches
+from apps.pets.models import Pet
+from apps.users.models import User
+
+
+class SavedSearchAlertTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.shelter = User.objects.create_user(username='shelter', password='x', user_type='shelter')
+        self.adopter = User.objects.create_user(username='adopter', password='x')
+
+    def test_long_names_are_truncated_to_the_title_column(self):
+        SavedSearch.objects.create(user=self.adopter, name='s' * 100, filters={})
+        pet = Pet.objects.create(
+            name='p' * 100, species='dog', breed='Beagle', age_years=2, age_months=0,
+            gender='male', size='medium', weight=Decimal('20.0'), color='Tan',
+            shelter=self.shelter, description='Friendly', adoption_fee=Decimal('100.00'),
+        )
+        self.assertEqual(notify_saved_searches(pet), 1)
+        title = Notification.objects.get(recipient=self.adopter).title
+        self.assertLessEqual(len(title), Notification._meta.get_field('title').max_length)
+
+    def test_background_job_errors_are_logged_not_raised(self):
+        failing = mock.Mock(side_effect=RuntimeError('boom'), __name__='failing')
+        # Closing connections would end the test transaction
+        with mock.patch('apps.notifications.fanout.close_old_connections'), \
+                self.assertLogs('apps.notifications.fanout', level='ERROR'):
+            _run_logged(failing, ())
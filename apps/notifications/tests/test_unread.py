@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.notifications.models import Notification
+from apps.notifications.unread import get_unread_count, reconcile_unread_counts, _key
+from apps.users.models import User
+
+
+class UnreadCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reader', password='x')
+
+    def notify(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notification.objects.create(
+                recipient=self.user, notification_type='system_announcement', title='t', message='m'
+            )
+
+    def test_creation_increments_a_seeded_counter(self):
+        self.notify()
+        self.assertEqual(get_unread_count(self.user.pk), 1)
+        self.notify()
+        self.assertEqual(cache.get(_key(self.user.pk)), 2)
+        self.assertEqual(get_unread_count(self.user.pk), 2)
+
+    def test_read_between_write_and_increment_is_not_double_counted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(
+                recipient=self.user, notification_type='system_announcement', title='t', message='m'
+            )
+            # The row is visible but its increment hasn't run yet
+            self.assertEqual(get_unread_count(self.user.pk), 1)
+        self.assertEqual(get_unread_count(self.user.pk), 1)
+
+    def test_mark_as_read_decrements_once(self):
+        notification = self.notify()
+        self.notify()
+        self.assertEqual(get_unread_count(self.user.pk), 2)
+        stale_copy = Notification.objects.get(pk=notification.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.mark_as_read()
+            stale_copy.mark_as_read()
+        self.assertEqual(get_unread_count(self.user.pk), 1)
+
+    def test_deleting_an_unread_notification_decrements(self):
+        notification = self.notify()
+        self.assertEqual(get_unread_count(self.user.pk), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.delete()
+        self.assertEqual(get_unread_count(self.user.pk), 0)
+
+    def test_mark_all_read_moves_the_counter_after_commit(self):
+        self.notify()
+        self.notify()
+        self.assertEqual(get_unread_count(self.user.pk), 2)
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(reverse('notifications:mark_all_read'))
+        self.assertEqual(cache.get(_key(self.user.pk)), 2)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_unread_count(self.user.pk), 0)
+
+    def test_reconcile_heals_drift(self):
+        self.notify()
+        get_unread_count(self.user.pk)
+        cache.set(_key(self.user.pk), 7)
+        reconcile_unread_counts()
+        self.assertEqual(get_unread_count(self.user.pk), 1)
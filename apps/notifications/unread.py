@@ -0,0 +1,153 @@
+"""
+Per-user unread notification counters
+
+The unread badge is a single cache read. Counters are seeded from the
+database on a miss and then moved with atomic ``incr``/``decr`` as
+notifications are created, read and deleted.
+
+A seed races with changes committing around it: it may or may not already
+include a change whose ``incr`` lands after it. So every change is bracketed:
+``begin_unread_change`` runs before the database write and bumps a per-user
+generation and pending count. ``adjust_unread_count`` or
+``reset_unread_count`` runs once the write has committed and closes the
+change. Reads never seed while a change is pending. A seed whose generation
+moved while it was counting is dropped again, and the next read counts
+afresh. Pending counts expire after ``PENDING_TIMEOUT``, so a rolled back
+change only disables seeding briefly.
+
+Keys expire after ``UNREAD_COUNT_TIMEOUT``. ``reconcile_unread_counts``
+rewrites them all from the database and should run periodically, e.g. every
+15 minutes from cron or the beat scheduler via the
+``reconcile_unread_counts`` management command. That heals drift from
+writes that bypass these hooks.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from apps.users.models import User
+from .models import Notification
+
+
+# Seconds an open change blocks seeding if it is never closed (e.g. rolled back)
+PENDING_TIMEOUT = 60
+
+
+def _key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def _generation_key(user_id):
+    return f'notifications:unread:{user_id}:gen'
+
+
+def _pending_key(user_id):
+    return f'notifications:unread:{user_id}:pending'
+
+
+def _timeout():
+    return getattr(settings, 'UNREAD_COUNT_TIMEOUT', 24 * 60 * 60)
+
+
+def _bump_generation(user_id):
+    key = _generation_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def _end_change(user_id):
+    try:
+        if cache.decr(_pending_key(user_id)) <= 0:
+            cache.delete(_pending_key(user_id))
+    except ValueError:
+        pass
+
+
+def count_unread(user_id):
+    """Unread count straight from the database"""
+    return Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+
+
+def get_unread_count(user_id):
+    count = cache.get(_key(user_id))
+    if count is not None:
+        return max(count, 0)
+
+    generation = cache.get(_generation_key(user_id))
+    count = count_unread(user_id)
+    if cache.get(_pending_key(user_id)):
+        # A change is between its write and its adjustment
+        return count
+    # add() so a concurrent increment is never overwritten by a stale seed
+    if not cache.add(_key(user_id), count, _timeout()):
+        return max(cache.get(_key(user_id), count), 0)
+    if cache.get(_generation_key(user_id)) != generation:
+        # A change committed while counting; its adjustment may be in the seed
+        cache.delete(_key(user_id))
+    return count
+
+
+def begin_unread_change(user_id):
+    """
+    Open a change to ``user_id``'s unread notifications, before writing it.
+
+    Close it with exactly one ``adjust_unread_count`` or ``reset_unread_count``
+    after the write commits.
+    """
+    _bump_generation(user_id)
+    cache.add(_pending_key(user_id), 0, PENDING_TIMEOUT)
+    try:
+        cache.incr(_pending_key(user_id))
+    except ValueError:
+        pass
+
+
+def adjust_unread_count(user_id, delta):
+    """Atomically move a cached counter once the change has committed"""
+    _bump_generation(user_id)
+    try:
+        if delta:
+            count = cache.incr(_key(user_id), delta)
+            if count < 0:
+                cache.delete(_key(user_id))
+    except ValueError:
+        # Uncached; the next read seeds from the database
+        pass
+    finally:
+        _end_change(user_id)
+
+
+def reset_unread_count(user_id):
+    """Drop a counter once a change of unknown size has committed"""
+    _bump_generation(user_id)
+    cache.delete(_key(user_id))
+    _end_change(user_id)
+
+
+def reconcile_unread_counts(chunk_size=1000):
+    """Rewrite every user's counter from the database; returns users written"""
+    written = 0
+    user_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        generation_keys = {_generation_key(user_id): user_id for user_id in chunk}
+        before = cache.get_many(generation_keys)
+        pending = cache.get_many([_pending_key(user_id) for user_id in chunk])
+        unread = dict(
+            Notification.objects.filter(recipient_id__in=chunk, is_read=False)
+            .values('recipient_id').annotate(count=Count('pk')).order_by()
+            .values_list('recipient_id', 'count')
+        )
+        cache.set_many({_key(user_id): unread.get(user_id, 0) for user_id in chunk}, _timeout())
+        after = cache.get_many(generation_keys)
+        # Counters that changed mid-query are left for the next read to seed
+        changed = [
+            key for key, user_id in generation_keys.items()
+            if before.get(key) != after.get(key) or pending.get(_pending_key(user_id))
+        ]
+        cache.delete_many([_key(generation_keys[key]) for key in changed])
+        written += len(chunk) - len(changed)
+    return written
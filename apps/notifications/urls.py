@@ -9,6 +9,8 @@ urlpatterns = [
     path('mark-read/<int:notification_id>/', views.mark_notification_read, name='mark_read'),
     path('mark-all-read/', views.mark_all_read, name='mark_all_read'),
     path('unread-count/', views.get_unread_count, name='unread_count'),
+    path('stream/', views.notification_stream, name='stream'),
+    path('fanout/<str:job_id>/', views.fanout_progress, name='fanout_progress'),
     
     # Adoption Requests
     path('quick-request/<int:pet_id>/', views.quick_adoption_request, name='quick_request'),
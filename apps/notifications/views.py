@@ -1,26 +1,54 @@
+import threading
+import time
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.views.generic import ListView, DetailView, CreateView
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.db import connection, transaction
 from django.db.models import Q
+from django.conf import settings
 
+from .events import format_event, notification_payload, push_unread_count, unread_count
+from .fanout import get_progress
 from .models import Notification, AdoptionRequest
+from .pubsub import subscribe
+from .querysets import inbox_queryset
+from .unread import adjust_unread_count, begin_unread_change
 from .forms import AdoptionRequestForm
+from apps.core.pagination import InvalidCursor, KeysetPaginator
 from apps.pets.models import Pet
 
 
+INBOX_PAGE_SIZE = 20
+
+
 @login_required
 def notifications_list(request):
-    """List all notifications for the current user"""
-    notifications = Notification.objects.filter(recipient=request.user)
-    unread_count = notifications.filter(is_read=False).count()
+    """List the current user's notifications, one keyset page at a time"""
+    unread_only = request.GET.get('unread') == '1'
+    paginator = KeysetPaginator(inbox_queryset(request.user, unread_only), ['-created_at'], INBOX_PAGE_SIZE)
+    try:
+        page = paginator.page(request.GET.get('cursor') or None)
+    except InvalidCursor:
+        raise Http404('Invalid cursor')
+    
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        # Infinite scroll appends the next batch of rows client-side
+        return JsonResponse({
+            'notifications': [notification_payload(notification) for notification in page],
+            'next_cursor': page.next_cursor,
+        })
     
     context = {
-        'notifications': notifications[:20],  # Latest 20 notifications
-        'unread_count': unread_count,
+        'notifications': page.object_list,
+        'page': page,
+        'next_cursor': page.next_cursor,
+        'unread_only': unread_only,
+        'unread_count': unread_count(request.user.pk),
     }
     return render(request, 'notifications/list.html', context)
 
@@ -40,10 +68,15 @@ def mark_notification_read(request, notification_id):
 @login_required
 def mark_all_read(request):
     """Mark all notifications as read"""
-    Notification.objects.filter(recipient=request.user, is_read=False).update(
+    user_id = request.user.pk
+    begin_unread_change(user_id)
+    marked = Notification.objects.filter(recipient=request.user, is_read=False).update(
         is_read=True, 
         read_at=timezone.now()
     )
+    # Like every other path, only once the update has committed
+    transaction.on_commit(lambda: adjust_unread_count(user_id, -marked))
+    transaction.on_commit(lambda: push_unread_count(user_id))
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({'status': 'success'})
@@ -55,8 +88,89 @@ def mark_all_read(request):
 @login_required
 def get_unread_count(request):
     """Get unread notification count (AJAX endpoint)"""
-    count = Notification.objects.filter(recipient=request.user, is_read=False).count()
-    return JsonResponse({'unread_count': count})
+    return JsonResponse({'unread_count': unread_count(request.user.pk)})
+
+
+@login_required
+def fanout_progress(request, job_id):
+    """Progress of a bulk notification job (AJAX endpoint)"""
+    progress = get_progress(job_id)
+    if progress is None:
+        return JsonResponse({'error': 'Unknown or expired job'}, status=404)
+    if progress.get('sender_id') != request.user.pk and request.user.user_type != 'admin':
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+    return JsonResponse({'job_id': job_id, **progress})
+
+
+# Streams a worker may hold at once; the rest of its threads stay free for
+# regular pages and health checks
+_stream_slots = threading.BoundedSemaphore(getattr(settings, 'NOTIFICATION_MAX_STREAMS', 30))
+
+
+class _EventStream:
+    """An event stream holding one of this worker's stream slots until closed"""
+
+    def __init__(self, user_id, last_event_id):
+        self._events = _event_stream(user_id, last_event_id)
+        self._released = False
+
+    def __iter__(self):
+        return self._events
+
+    def close(self):
+        # Called by the server even when the stream was never iterated
+        self._events.close()
+        if not self._released:
+            self._released = True
+            _stream_slots.release()
+
+
+def _event_stream(user_id, last_event_id):
+    keepalive = getattr(settings, 'NOTIFICATION_STREAM_KEEPALIVE', 15)
+    lifetime = getattr(settings, 'NOTIFICATION_STREAM_LIFETIME', 300)
+    with subscribe(user_id) as subscription:
+        # Clients reconnect after ``lifetime``; tell them to do so promptly
+        yield 'retry: 2000\n\n'
+        if last_event_id:
+            missed = Notification.objects.filter(
+                recipient_id=user_id, pk__gt=last_event_id
+            ).order_by('pk')[:50]
+            for notification in missed:
+                yield format_event('notification', notification_payload(notification), notification.pk)
+        yield format_event('unread_count', {'unread_count': unread_count(user_id)})
+        # Don't pin a database connection for the idle life of the stream
+        connection.close()
+
+        deadline = time.monotonic() + lifetime
+        while time.monotonic() < deadline:
+            message = subscription.get(timeout=keepalive)
+            if message is None:
+                yield ': keepalive\n\n'
+            else:
+                yield format_event(message['event'], message['data'], message.get('id'))
+
+
+@login_required
+def notification_stream(request):
+    """Server-Sent Events stream of new notifications and unread count changes"""
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_event_id = 0
+    
+    if not _stream_slots.acquire(blocking=False):
+        # Clients fall back to polling unread-count/ and retry later
+        response = JsonResponse({'error': 'Too many live streams, retry later'}, status=503)
+        response['Retry-After'] = '30'
+        return response
+    
+    response = StreamingHttpResponse(
+        _EventStream(request.user.pk, last_event_id),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 @login_required
@@ -0,0 +1,107 @@
+"""
+Typeahead index over pet names, breeds and shelter organization names
+
+Every distinct value is stored in a sorted array under each of its word
+starts, so "shep" completes both "Shepherd Mix" and "German Shepherd".
+Completions for a prefix are a binary search plus a bounded scan, ranked by
+how many available pets carry the value. The index lives in process memory
+and is updated incrementally from Pet change signals, so the request path
+never touches the database.
+"""
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
+
+from apps.core.indexing import InMemoryIndex, register
+from .models import Pet
+from .signals import PETS_NAMESPACE
+
+
+KINDS = ('name', 'breed', 'shelter')
+
+# Upper bound on index entries examined per lookup
+MAX_SCAN = 2000
+
+
+def normalize(text):
+    return ' '.join((text or '').lower().split())
+
+
+def word_starts(text):
+    words = normalize(text).split(' ')
+    return [' '.join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+class AutocompleteIndex(InMemoryIndex):
+    namespace = PETS_NAMESPACE
+
+    def build(self):
+        self._counts = Counter()
+        self._keys = []
+        self._pet_terms = {}
+        rows = Pet.objects.filter(status='available').values_list(
+            'pk', 'name', 'breed', 'shelter__shelter_profile__organization_name'
+        )
+        for pk, name, breed, organization in rows.iterator():
+            self._add_pet(pk, name, breed, organization)
+
+    def _add_term(self, kind, value):
+        self._counts[(kind, value)] += 1
+        if self._counts[(kind, value)] == 1:
+            for start in word_starts(value):
+                insort(self._keys, (start, kind, value))
+
+    def _remove_term(self, kind, value):
+        self._counts[(kind, value)] -= 1
+        if self._counts[(kind, value)] > 0:
+            return
+        del self._counts[(kind, value)]
+        for start in word_starts(value):
+            key = (start, kind, value)
+            index = bisect_left(self._keys, key)
+            if index < len(self._keys) and self._keys[index] == key:
+                del self._keys[index]
+
+    def _add_pet(self, pk, name, breed, organization):
+        terms = [(kind, value) for kind, value in zip(KINDS, (name, breed, organization)) if value]
+        for kind, value in terms:
+            self._add_term(kind, value)
+        self._pet_terms[pk] = terms
+
+    def upsert(self, pet):
+        self.remove(pet.pk)
+        if pet.status != 'available':
+            return
+        profile = getattr(pet.shelter, 'shelter_profile', None)
+        organization = profile.organization_name if profile else ''
+        self._add_pet(pet.pk, pet.name, pet.breed, organization)
+
+    def remove(self, pk):
+        for kind, value in self._pet_terms.pop(pk, ()):
+            self._remove_term(kind, value)
+
+    def complete(self, prefix, limit=10, kinds=KINDS):
+        """Top ``limit`` completions of ``prefix``, most frequent first"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        self.ensure_fresh(consistent=False)
+        with self._lock:
+            start = bisect_left(self._keys, (prefix,))
+            stop = min(len(self._keys), start + MAX_SCAN)
+            candidates = {}
+            for index in range(start, stop):
+                term, kind, value = self._keys[index]
+                if not term.startswith(prefix):
+                    break
+                if kind in kinds:
+                    candidates[(kind, value)] = self._counts[(kind, value)]
+
+        best = heapq.nsmallest(
+            limit, candidates.items(), key=lambda item: (-item[1], item[0][1].lower())
+        )
+        return [{'value': value, 'type': kind, 'count': count} for (kind, value), count in best]
+
+
+autocomplete_index = register(AutocompleteIndex())
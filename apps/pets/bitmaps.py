@@ -0,0 +1,283 @@
+"""
+Compressed bitmap index over pet flags and enums
+
+Each (column, value) pair of the compatibility flags and the status, species
+and size enums maps to a roaring-style bitmap of pet IDs. IDs are split into
+64K chunks; a sparse chunk is stored as a sorted array and a dense one as a
+bitset, so combined filters resolve to candidate IDs with bitwise AND/OR
+before any SQL runs.
+
+The index is opt-in through the ``PET_BITMAP_INDEX`` setting.
+"""
+from bisect import bisect_left
+
+from django.conf import settings
+
+from apps.core.cache_utils import get_version
+from apps.core.indexing import InMemoryIndex, register
+from .models import Pet
+from .signals import PETS_NAMESPACE
+
+
+FLAG_COLUMNS = (
+    'good_with_kids', 'good_with_dogs', 'good_with_cats',
+    'house_trained', 'is_spayed_neutered', 'is_vaccinated',
+)
+
+ENUM_COLUMNS = ('status', 'species', 'size')
+
+# Chunks holding more values than this are stored as bitsets
+ARRAY_LIMIT = 4096
+
+
+def _popcount(bits):
+    return bin(bits).count('1')
+
+
+def _to_bits(values):
+    bits = 0
+    for value in values:
+        bits |= 1 << value
+    return bits
+
+
+def _from_bits(bits):
+    values = []
+    while bits:
+        lowest = bits & -bits
+        values.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return values
+
+
+def _normalize(bits):
+    """Store a chunk in its cheapest form, or None when it is empty"""
+    if not bits:
+        return None
+    if _popcount(bits) <= ARRAY_LIMIT:
+        return _from_bits(bits)
+    return bits
+
+
+def _and(a, b):
+    if isinstance(a, int) and isinstance(b, int):
+        return _normalize(a & b)
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return [value for value in a if b >> value & 1] or None
+    return sorted(set(a).intersection(b)) or None
+
+
+def _or(a, b):
+    if isinstance(a, list) and isinstance(b, list):
+        merged = sorted(set(a).union(b))
+        return merged if len(merged) <= ARRAY_LIMIT else _to_bits(merged)
+    a = a if isinstance(a, int) else _to_bits(a)
+    b = b if isinstance(b, int) else _to_bits(b)
+    return a | b
+
+
+def _andnot(a, b):
+    if isinstance(b, list):
+        b = _to_bits(b)
+    if isinstance(a, list):
+        return [value for value in a if not b >> value & 1] or None
+    return _normalize(a & ~b)
+
+
+class RoaringBitmap:
+    __slots__ = ('_chunks',)
+
+    def __init__(self, values=()):
+        self._chunks = {}
+        for value in values:
+            self.add(value)
+
+    @classmethod
+    def _from_chunks(cls, chunks):
+        bitmap = cls()
+        bitmap._chunks = {high: chunk for high, chunk in chunks.items() if chunk is not None}
+        return bitmap
+
+    def add(self, value):
+        high, low = value >> 16, value & 0xFFFF
+        chunk = self._chunks.get(high)
+        if chunk is None:
+            self._chunks[high] = [low]
+        elif isinstance(chunk, int):
+            self._chunks[high] = chunk | (1 << low)
+        else:
+            index = bisect_left(chunk, low)
+            if index == len(chunk) or chunk[index] != low:
+                chunk.insert(index, low)
+                if len(chunk) > ARRAY_LIMIT:
+                    self._chunks[high] = _to_bits(chunk)
+
+    def discard(self, value):
+        high, low = value >> 16, value & 0xFFFF
+        chunk = self._chunks.get(high)
+        if chunk is None:
+            return
+        if isinstance(chunk, int):
+            chunk = _normalize(chunk & ~(1 << low))
+        else:
+            chunk = [existing for existing in chunk if existing != low] or None
+        if chunk is None:
+            del self._chunks[high]
+        else:
+            self._chunks[high] = chunk
+
+    def __contains__(self, value):
+        chunk = self._chunks.get(value >> 16)
+        if chunk is None:
+            return False
+        low = value & 0xFFFF
+        if isinstance(chunk, int):
+            return bool(chunk >> low & 1)
+        index = bisect_left(chunk, low)
+        return index < len(chunk) and chunk[index] == low
+
+    def __and__(self, other):
+        shared = self._chunks.keys() & other._chunks.keys()
+        return self._from_chunks({
+            high: _and(self._chunks[high], other._chunks[high]) for high in shared
+        })
+
+    def __or__(self, other):
+        chunks = dict(self._chunks)
+        for high, chunk in other._chunks.items():
+            chunks[high] = _or(chunks[high], chunk) if high in chunks else chunk
+        return self._from_chunks(chunks)
+
+    def __sub__(self, other):
+        chunks = {}
+        for high, chunk in self._chunks.items():
+            other_chunk = other._chunks.get(high)
+            chunks[high] = chunk if other_chunk is None else _andnot(chunk, other_chunk)
+        return self._from_chunks(chunks)
+
+    def __iter__(self):
+        for high in sorted(self._chunks):
+            chunk = self._chunks[high]
+            lows = _from_bits(chunk) if isinstance(chunk, int) else chunk
+            for low in lows:
+                yield (high << 16) | low
+
+    def __len__(self):
+        return sum(
+            _popcount(chunk) if isinstance(chunk, int) else len(chunk)
+            for chunk in self._chunks.values()
+        )
+
+    def __bool__(self):
+        return bool(self._chunks)
+
+
+def bitmap_index_enabled():
+    return getattr(settings, 'PET_BITMAP_INDEX', False)
+
+
+class PetBitmapIndex(InMemoryIndex):
+    namespace = PETS_NAMESPACE
+
+    def _keys(self, values):
+        keys = [(column, values[column]) for column in ENUM_COLUMNS]
+        keys += [(column, True) for column in FLAG_COLUMNS if values[column]]
+        return keys
+
+    def _add(self, pk, values):
+        keys = self._keys(values)
+        for key in keys:
+            self._bitmaps.setdefault(key, RoaringBitmap()).add(pk)
+        self._all.add(pk)
+        self._pet_keys[pk] = keys
+
+    def build(self):
+        self._bitmaps = {}
+        self._all = RoaringBitmap()
+        self._pet_keys = {}
+        rows = Pet.objects.order_by('pk').values('pk', *ENUM_COLUMNS, *FLAG_COLUMNS)
+        for row in rows.iterator():
+            self._add(row['pk'], row)
+
+    def upsert(self, pet):
+        self.remove(pet.pk)
+        self._add(pet.pk, {column: getattr(pet, column) for column in (*ENUM_COLUMNS, *FLAG_COLUMNS)})
+
+    def remove(self, pk):
+        for key in self._pet_keys.pop(pk, ()):
+            self._bitmaps[key].discard(pk)
+        self._all.discard(pk)
+
+    def _column_bitmap(self, column, value):
+        if column in FLAG_COLUMNS:
+            flagged = self._bitmaps.get((column, True), RoaringBitmap())
+            return flagged if value else self._all - flagged
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        result = RoaringBitmap()
+        for item in values:
+            result = result | self._bitmaps.get((column, item), RoaringBitmap())
+        return result
+
+    def candidates(self, predicates):
+        """
+        Pet IDs matching every predicate.
+
+        ``predicates`` maps flag columns to booleans and enum columns to a
+        value or a list of values (OR-ed). Returns None without predicates,
+        or when the index is not at the current version: candidates from a
+        stale index could leave out pets that match.
+        """
+        if not predicates:
+            return None
+        self.ensure_fresh()
+        current = get_version(self.namespace)
+        with self._lock:
+            if self._version != current:
+                return None
+            result = None
+            for column, value in predicates.items():
+                bitmap = self._column_bitmap(column, value)
+                result = bitmap if result is None else result & bitmap
+                if not result:
+                    break
+            return result
+
+
+bitmap_index = register(PetBitmapIndex())
+
+
+def bitmap_predicates(data):
+    """Indexed predicates present in filter form or serializer data"""
+    predicates = {}
+    for column in ENUM_COLUMNS:
+        if data.get(column):
+            predicates[column] = data[column]
+    for column in FLAG_COLUMNS:
+        if data.get(column) is not None:
+            predicates[column] = data[column]
+    return predicates
+
+
+def narrow_queryset(queryset, predicates):
+    """
+    Narrow ``queryset`` to the bitmap candidates for ``predicates``.
+
+    An empty candidate set skips SQL entirely. Small sets become a primary
+    key lookup; large ones are left to the regular column filters, which
+    callers keep applying in every case. The queryset is returned unchanged
+    unless the index was built at the current ``PETS`` version, since the
+    column filters cannot bring back rows a stale narrowing removed.
+    """
+    if not bitmap_index_enabled():
+        return queryset
+    candidates = bitmap_index.candidates(predicates)
+    if candidates is None:
+        return queryset
+    if not candidates:
+        return queryset.none()
+    max_ids = getattr(settings, 'PET_BITMAP_MAX_IDS', 500)
+    if len(candidates) <= max_ids:
+        return queryset.filter(pk__in=list(candidates))
+    return queryset
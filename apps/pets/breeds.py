@@ -0,0 +1,46 @@
+"""
+Canonical breed names for each entry of ``Pet.SPECIES_CHOICES``
+
+Used by the trigram index in ``apps.pets.fuzzy`` to recognise misspelled
+breeds such as "labrodor" or "german shepard".
+"""
+
+CANONICAL_BREEDS = {
+    'dog': [
+        'Akita', 'Australian Cattle Dog', 'Australian Shepherd', 'Basset Hound',
+        'Beagle', 'Bernese Mountain Dog', 'Bichon Frise', 'Border Collie',
+        'Boston Terrier', 'Boxer', 'Bulldog', 'Cavalier King Charles Spaniel',
+        'Chihuahua', 'Cocker Spaniel', 'Dachshund', 'Doberman Pinscher',
+        'French Bulldog', 'German Shepherd', 'Golden Retriever', 'Great Dane',
+        'Greyhound', 'Havanese', 'Husky', 'Jack Russell Terrier',
+        'Labrador Retriever', 'Maltese', 'Mastiff', 'Miniature Schnauzer',
+        'Mixed Breed', 'Newfoundland', 'Pit Bull Terrier', 'Pomeranian',
+        'Poodle', 'Pug', 'Rottweiler', 'Saint Bernard', 'Shetland Sheepdog',
+        'Shiba Inu', 'Shih Tzu', 'Siberian Husky', 'Staffordshire Bull Terrier',
+        'Weimaraner', 'Yorkshire Terrier',
+    ],
+    'cat': [
+        'Abyssinian', 'American Shorthair', 'Bengal', 'Birman', 'Bombay',
+        'British Shorthair', 'Devon Rex', 'Domestic Longhair',
+        'Domestic Medium Hair', 'Domestic Shorthair', 'Exotic Shorthair',
+        'Maine Coon', 'Norwegian Forest Cat', 'Persian', 'Ragdoll',
+        'Russian Blue', 'Scottish Fold', 'Siamese', 'Sphynx', 'Tabby',
+        'Tuxedo',
+    ],
+    'bird': [
+        'African Grey Parrot', 'Budgerigar', 'Canary', 'Cockatiel', 'Cockatoo',
+        'Conure', 'Finch', 'Lovebird', 'Macaw', 'Parakeet', 'Quaker Parrot',
+    ],
+    'rabbit': [
+        'Dutch', 'English Lop', 'Flemish Giant', 'Holland Lop', 'Lionhead',
+        'Mini Lop', 'Mini Rex', 'Netherland Dwarf', 'New Zealand', 'Rex',
+    ],
+    'hamster': [
+        'Campbell Dwarf', 'Chinese', 'Roborovski', 'Syrian', 'Winter White Dwarf',
+    ],
+    'guinea_pig': [
+        'Abyssinian', 'American', 'Peruvian', 'Silkie', 'Skinny Pig', 'Teddy',
+        'Texel',
+    ],
+    'other': [],
+}
@@ -0,0 +1,292 @@
+"""
+In-memory columnar catalog of available pets
+
+The filterable columns of every available pet are held as NumPy arrays, so
+list and search predicates are evaluated vectorized and return ordered pet
+IDs. Only the rows of the requested page are then loaded from the database.
+
+The engine is optional: it is used when the ``PET_CATALOG_ENGINE`` setting
+is enabled and NumPy is installed. Each worker process keeps its own copy,
+refreshed incrementally from Pet change signals.
+"""
+from django.conf import settings
+from django.db.models import Q
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from apps.core.indexing import InMemoryIndex, register
+from .fuzzy import resolve_breeds
+from .models import Pet
+from .signals import PETS_NAMESPACE
+
+
+# Low-cardinality text columns, stored as integer codes into a vocabulary
+CATEGORY_COLUMNS = ('species', 'size', 'gender', 'name', 'breed', 'shelter_city', 'shelter_state')
+
+FLAG_COLUMNS = (
+    'good_with_kids', 'good_with_dogs', 'good_with_cats',
+    'house_trained', 'is_spayed_neutered', 'is_vaccinated',
+)
+
+NUMERIC_COLUMNS = ('age_years', 'weight', 'adoption_fee')
+
+ORDERING_COLUMNS = ('created_at', 'age_years', 'adoption_fee')
+
+DB_FIELDS = {'shelter_city': 'shelter__city', 'shelter_state': 'shelter__state'}
+
+
+def catalog_enabled():
+    return np is not None and getattr(settings, 'PET_CATALOG_ENGINE', False)
+
+
+def criteria(equals=None, contains=None, ranges=None):
+    """
+    Build a predicate spec understood by the catalog and ``criteria_q``.
+
+    ``equals`` maps columns to an exact value or a list of accepted values,
+    ``contains`` is a list of
+    ``(columns, text)`` pairs matching when any column contains ``text``
+    case-insensitively, or ``(columns, text, values)`` triples that also
+    match when a column equals one of ``values``, and ``ranges`` maps numeric columns to inclusive
+    ``(low, high)`` bounds where either side may be None.
+    """
+    return {'equals': equals or {}, 'contains': contains or [], 'ranges': ranges or {}}
+
+
+def criteria_from_search(data):
+    """Predicates of ``SearchSerializer.validated_data``, except ``query``"""
+    equals = {field: data[field] for field in ('species', 'size', 'gender') if data.get(field)}
+    for flag in ('good_with_kids', 'good_with_dogs', 'good_with_cats', 'house_trained'):
+        if data.get(flag) is not None:
+            equals[flag] = data[flag]
+
+    contains = []
+    if data.get('breed'):
+        breed = data['breed']
+        contains.append((('breed',), breed, resolve_breeds(breed, data.get('species'))))
+    if data.get('location'):
+        contains.append((('shelter_city', 'shelter_state'), data['location']))
+
+    ranges = {}
+    if data.get('age_min') is not None or data.get('age_max') is not None:
+        ranges['age_years'] = (data.get('age_min'), data.get('age_max'))
+    if data.get('max_fee') is not None:
+        ranges['adoption_fee'] = (None, data['max_fee'])
+
+    return criteria(equals, contains, ranges)
+
+
+def criteria_from_filterset(cleaned_data):
+    """Predicates of a bound ``apps.pets.filters.PetFilter``"""
+    equals = {field: cleaned_data[field] for field in ('species', 'size', 'gender')
+              if cleaned_data.get(field)}
+    for flag in FLAG_COLUMNS:
+        if cleaned_data.get(flag) is not None:
+            equals[flag] = cleaned_data[flag]
+
+    contains = []
+    if cleaned_data.get('breed'):
+        breed = cleaned_data['breed']
+        contains.append((('breed',), breed, resolve_breeds(breed, cleaned_data.get('species'))))
+    if cleaned_data.get('name'):
+        contains.append((('name',), cleaned_data['name']))
+
+    ranges = {}
+    for field in ('age_years', 'adoption_fee'):
+        value = cleaned_data.get(field)
+        if value and (value.start is not None or value.stop is not None):
+            ranges[field] = (value.start, value.stop)
+
+    return criteria(equals, contains, ranges)
+
+
+def criteria_q(spec):
+    """The ORM equivalent of a predicate spec"""
+    condition = Q()
+    for column, value in spec['equals'].items():
+        if isinstance(value, (list, tuple, set)):
+            condition &= Q(**{f'{DB_FIELDS.get(column, column)}__in': value})
+        else:
+            condition &= Q(**{DB_FIELDS.get(column, column): value})
+    for columns, text, *values in spec['contains']:
+        any_match = Q()
+        for column in columns:
+            field = DB_FIELDS.get(column, column)
+            any_match |= Q(**{f'{field}__icontains': text})
+            if values and values[0]:
+                any_match |= Q(**{f'{field}__in': values[0]})
+        condition &= any_match
+    for column, (low, high) in spec['ranges'].items():
+        if low is not None:
+            condition &= Q(**{f'{column}__gte': low})
+        if high is not None:
+            condition &= Q(**{f'{column}__lte': high})
+    return condition
+
+
+def hydrate(pet_ids, queryset=None):
+    """Load ``pet_ids`` from the database, preserving their order"""
+    if queryset is None:
+        queryset = Pet.objects.all()
+    pets = queryset.in_bulk(pet_ids)
+    return [pets[pk] for pk in pet_ids if pk in pets]
+
+
+class PetCatalog(InMemoryIndex):
+    namespace = PETS_NAMESPACE
+
+    def _allocate(self, capacity):
+        self._capacity = capacity
+        self._size = 0
+        self._rows = {}
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._created = np.zeros(capacity, dtype=np.float64)
+        self._codes = {column: np.zeros(capacity, dtype=np.int32) for column in CATEGORY_COLUMNS}
+        self._vocab = {column: {} for column in CATEGORY_COLUMNS}
+        self._flags = {column: np.zeros(capacity, dtype=bool) for column in FLAG_COLUMNS}
+        self._numeric = {column: np.zeros(capacity, dtype=np.float64) for column in NUMERIC_COLUMNS}
+
+    def _grow(self):
+        extra = self._capacity
+        self._capacity += extra
+
+        def grown(array):
+            return np.concatenate([array, np.zeros(extra, dtype=array.dtype)])
+
+        self._ids = grown(self._ids)
+        self._alive = grown(self._alive)
+        self._created = grown(self._created)
+        self._codes = {column: grown(array) for column, array in self._codes.items()}
+        self._flags = {column: grown(array) for column, array in self._flags.items()}
+        self._numeric = {column: grown(array) for column, array in self._numeric.items()}
+
+    def _code(self, column, value):
+        vocab = self._vocab[column]
+        if value not in vocab:
+            vocab[value] = len(vocab)
+        return vocab[value]
+
+    def _write(self, values):
+        pk = values['id']
+        row = self._rows.get(pk)
+        if row is None:
+            if self._size == self._capacity:
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._rows[pk] = row
+
+        self._ids[row] = pk
+        self._alive[row] = True
+        self._created[row] = values['created_at'].timestamp()
+        for column in CATEGORY_COLUMNS:
+            self._codes[column][row] = self._code(column, values[column] or '')
+        for column in FLAG_COLUMNS:
+            self._flags[column][row] = values[column]
+        for column in NUMERIC_COLUMNS:
+            self._numeric[column][row] = float(values[column] or 0)
+
+    def build(self):
+        fields = ['id', 'created_at', *FLAG_COLUMNS, *NUMERIC_COLUMNS]
+        fields += [DB_FIELDS.get(column, column) for column in CATEGORY_COLUMNS]
+        rows = Pet.objects.filter(status='available').order_by().values(*fields)
+
+        self._allocate(max(rows.count(), 64))
+        for row in rows.iterator():
+            for column, field in DB_FIELDS.items():
+                row[column] = row.pop(field)
+            self._write(row)
+
+    def upsert(self, pet):
+        if pet.status != 'available':
+            self.remove(pet.pk)
+            return
+        values = {'id': pet.pk, 'created_at': pet.created_at}
+        for column in (*FLAG_COLUMNS, *NUMERIC_COLUMNS, 'species', 'size', 'gender', 'name', 'breed'):
+            values[column] = getattr(pet, column)
+        values['shelter_city'] = pet.shelter.city
+        values['shelter_state'] = pet.shelter.state
+        self._write(values)
+
+    def remove(self, pk):
+        row = self._rows.pop(pk, None)
+        if row is not None:
+            self._alive[row] = False
+
+    def _mask(self, spec):
+        size = self._size
+        mask = self._alive[:size].copy()
+
+        for column, value in spec['equals'].items():
+            if column in FLAG_COLUMNS:
+                mask &= self._flags[column][:size] == bool(value)
+                continue
+            if isinstance(value, (list, tuple, set)):
+                codes = [self._vocab[column][v] for v in value if v in self._vocab[column]]
+                mask &= np.isin(self._codes[column][:size], codes)
+                continue
+            code = self._vocab[column].get(value)
+            if code is None:
+                return np.zeros(size, dtype=bool)
+            mask &= self._codes[column][:size] == code
+
+        for columns, text, *values in spec['contains']:
+            text = text.lower()
+            also = set(values[0]) if values else set()
+            any_match = np.zeros(size, dtype=bool)
+            for column in columns:
+                codes = [code for value, code in self._vocab[column].items()
+                         if text in value.lower() or value in also]
+                if codes:
+                    any_match |= np.isin(self._codes[column][:size], codes)
+            mask &= any_match
+
+        for column, (low, high) in spec['ranges'].items():
+            values = self._numeric[column][:size]
+            if low is not None:
+                mask &= values >= float(low)
+            if high is not None:
+                mask &= values <= float(high)
+
+        return mask
+
+    def filter_ids(self, spec, ordering='-created_at'):
+        """IDs of the available pets matching ``spec``, in ``ordering`` order"""
+        column = ordering.lstrip('-')
+        if column not in ORDERING_COLUMNS:
+            raise ValueError(f'Unsupported ordering: {ordering}')
+        sign = -1 if ordering.startswith('-') else 1
+
+        self.ensure_fresh()
+        with self._lock:
+            rows = np.flatnonzero(self._mask(spec))
+            keys = self._created if column == 'created_at' else self._numeric[column]
+            ids = self._ids[rows]
+            # lexsort sorts by the last key first; the id breaks ties
+            order = np.lexsort((sign * ids, sign * keys[rows]))
+            return ids[order].tolist()
+
+    def columns(self, names):
+        """IDs of the available pets and copies of the requested columns, row-aligned"""
+        self.ensure_fresh()
+        with self._lock:
+            rows = np.flatnonzero(self._alive[:self._size])
+            data = {}
+            for name in names:
+                if name in FLAG_COLUMNS:
+                    data[name] = self._flags[name][rows]
+                elif name in NUMERIC_COLUMNS:
+                    data[name] = self._numeric[name][rows]
+                elif name == 'created_at':
+                    data[name] = self._created[rows]
+                else:
+                    values = np.array(list(self._vocab[name]), dtype=object)
+                    data[name] = values[self._codes[name][rows]]
+            return self._ids[rows], data
+
+
+catalog = register(PetCatalog())
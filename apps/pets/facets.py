@@ -0,0 +1,74 @@
+"""
+Faceted counts for the pet filter sidebar
+
+Every facet value is counted in a single aggregate query using conditional
+``Count(filter=Q(...))``. Results are cached per normalized filter and
+invalidated whenever a pet changes.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from apps.core.cache_utils import fingerprint, versioned_key
+from .models import Pet
+from .signals import PETS_NAMESPACE
+
+
+CHOICE_FACETS = {
+    'species': Pet.SPECIES_CHOICES,
+    'size': Pet.SIZE_CHOICES,
+    'gender': Pet.GENDER_CHOICES,
+}
+
+FLAG_FACETS = (
+    'good_with_kids', 'good_with_dogs', 'good_with_cats',
+    'house_trained', 'is_spayed_neutered', 'is_vaccinated',
+)
+
+
+def compute_facets(queryset):
+    """Count every facet value of ``queryset`` in one query"""
+    aggregates = {'total': Count('pk')}
+    choice_aliases = []
+    for field, choices in CHOICE_FACETS.items():
+        for value, label in choices:
+            alias = f'facet_{len(choice_aliases)}'
+            aggregates[alias] = Count('pk', filter=Q(**{field: value}))
+            choice_aliases.append((field, value, label, alias))
+    for flag in FLAG_FACETS:
+        aggregates[f'flag_{flag}'] = Count('pk', filter=Q(**{flag: True}))
+
+    row = queryset.order_by().aggregate(**aggregates)
+
+    facets = {'total': row['total']}
+    for field in CHOICE_FACETS:
+        facets[field] = []
+    for field, value, label, alias in choice_aliases:
+        facets[field].append({'value': value, 'label': label, 'count': row[alias]})
+    facets['flags'] = {flag: row[f'flag_{flag}'] for flag in FLAG_FACETS}
+    return facets
+
+
+def normalize_filters(cleaned_data):
+    """Drop empty values so equivalent filters share a cache entry"""
+    normalized = {}
+    for name, value in cleaned_data.items():
+        if isinstance(value, slice):
+            value = [value.start, value.stop]
+            if value == [None, None]:
+                continue
+        if value in (None, ''):
+            continue
+        normalized[name] = value
+    return normalized
+
+
+def get_facets(filterset):
+    """Cached facet counts for a bound, valid FilterSet"""
+    filters = normalize_filters(filterset.form.cleaned_data)
+    key = versioned_key(PETS_NAMESPACE, 'facets', fingerprint(filters))
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(filterset.qs)
+        cache.set(key, facets, getattr(settings, 'PET_FACETS_CACHE_TIMEOUT', 300))
+    return facets
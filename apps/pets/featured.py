@@ -0,0 +1,102 @@
+"""
+Featured pets rotation for the home page
+
+``refresh_featured_pets`` (run on a schedule) draws a weighted sample of the
+available pets. Pets waiting longest and pets with photos are favoured, and
+the picks are interleaved across species. The sample is split into a
+rotation of featured sets of pet IDs, stored in the cache. The home page
+reads that single object and loads the pets of the current time slot by
+primary key, in rotation order. The stored rotation is never edited in
+place: pets that have left ``available`` are filtered out as they are
+loaded, and the following sets' pets fill their places.
+"""
+import math
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .catalog import hydrate
+from .models import Pet
+
+
+ROTATION_CACHE_KEY = 'featured_pets:rotation'
+
+FEATURED_COUNT = 6
+ROTATION_SETS = 8
+
+# Extra weight for pets with at least one photo
+PHOTO_BOOST = 3.0
+
+
+def listing_weight(days_listed, has_photo):
+    """Sampling weight of a pet: grows with time listed, boosted by a photo"""
+    weight = 1.0 + math.log1p(max(days_listed, 0))
+    return weight * (PHOTO_BOOST if has_photo else 1.0)
+
+
+def _weighted_order(candidates, rng):
+    """
+    Pet IDs in weighted random order, interleaved across species.
+
+    Each species is shuffled by Efraimidis-Spirakis keys; the species then
+    take turns, led by whichever drew the strongest key.
+    """
+    by_species = {}
+    for pk, species, weight in candidates:
+        key = rng.random() ** (1.0 / weight)
+        by_species.setdefault(species, []).append((key, pk))
+    queues = sorted(
+        (sorted(entries, reverse=True) for entries in by_species.values()),
+        key=lambda entries: entries[0][0], reverse=True
+    )
+
+    order = []
+    while queues:
+        for queue in queues:
+            order.append(queue.pop(0)[1])
+        queues = [queue for queue in queues if queue]
+    return order
+
+
+def build_rotation(seed=None):
+    """Compute a fresh rotation of featured sets"""
+    rng = random.Random(seed)
+    now = time.time()
+    rows = Pet.objects.filter(status='available').annotate(
+        image_count=Count('images')
+    ).values_list('pk', 'species', 'created_at', 'image_count')
+    candidates = [
+        (pk, species, listing_weight((now - created_at.timestamp()) / 86400, image_count > 0))
+        for pk, species, created_at, image_count in rows.iterator()
+    ]
+
+    order = _weighted_order(candidates, rng)[:FEATURED_COUNT * ROTATION_SETS]
+    sets = [order[start:start + FEATURED_COUNT] for start in range(0, len(order), FEATURED_COUNT)]
+    return {'built_at': now, 'sets': sets or [[]]}
+
+
+def refresh_featured_pets(seed=None):
+    rotation = build_rotation(seed)
+    cache.set(ROTATION_CACHE_KEY, rotation, None)
+    return rotation
+
+
+def featured_pet_ids():
+    """Pet IDs of the current time slot's set, then of the following sets as spares"""
+    rotation = cache.get(ROTATION_CACHE_KEY)
+    if rotation is None:
+        # First request before the scheduled job has run
+        rotation = refresh_featured_pets()
+    sets = rotation['sets']
+    interval = getattr(settings, 'FEATURED_ROTATION_SECONDS', 15 * 60)
+    slot = int(time.time() // interval)
+    return [pk for offset in range(len(sets)) for pk in sets[(slot + offset) % len(sets)]]
+
+
+def featured_pets():
+    """``Pet`` instances of the current featured set, in rotation order"""
+    queryset = Pet.objects.filter(status='available').select_related('shelter').prefetch_related('images')
+    return hydrate(featured_pet_ids(), queryset)[:FEATURED_COUNT]
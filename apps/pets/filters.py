@@ -1,6 +1,18 @@
 import django_filters
 from django import forms
 from .models import Pet
+from .bitmaps import bitmap_predicates, narrow_queryset
+from .fuzzy import breed_q
+
+
+class FlagCheckboxInput(forms.CheckboxInput):
+    """A checkbox that requires the trait when ticked and ignores it otherwise"""
+
+    def value_from_datadict(self, data, files, name):
+        # CheckboxInput reads an absent box as False, which would filter on flag=False
+        if not super().value_from_datadict(data, files, name):
+            return None
+        return True
 
 
 class PetFilter(django_filters.FilterSet):
@@ -13,7 +25,7 @@ class PetFilter(django_filters.FilterSet):
     )
     
     breed = django_filters.CharFilter(
-        lookup_expr='icontains',
+        method='filter_breed',
         widget=forms.TextInput(attrs={
             'class': 'form-control',
             'placeholder': 'Search by breed...'
@@ -47,27 +59,27 @@ class PetFilter(django_filters.FilterSet):
     )
     
     good_with_kids = django_filters.BooleanFilter(
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+        widget=FlagCheckboxInput(attrs={'class': 'form-check-input'})
     )
     
     good_with_dogs = django_filters.BooleanFilter(
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+        widget=FlagCheckboxInput(attrs={'class': 'form-check-input'})
     )
     
     good_with_cats = django_filters.BooleanFilter(
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+        widget=FlagCheckboxInput(attrs={'class': 'form-check-input'})
     )
     
     house_trained = django_filters.BooleanFilter(
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+        widget=FlagCheckboxInput(attrs={'class': 'form-check-input'})
     )
     
     is_spayed_neutered = django_filters.BooleanFilter(
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+        widget=FlagCheckboxInput(attrs={'class': 'form-check-input'})
     )
     
     is_vaccinated = django_filters.BooleanFilter(
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+        widget=FlagCheckboxInput(attrs={'class': 'form-check-input'})
     )
 
     class Meta:
@@ -77,3 +89,12 @@ class PetFilter(django_filters.FilterSet):
             'good_with_kids', 'good_with_dogs', 'good_with_cats', 'house_trained',
             'is_spayed_neutered', 'is_vaccinated'
         ]
+
+    def filter_queryset(self, queryset):
+        # Resolve indexed flag/enum predicates with bitmaps before any SQL runs
+        queryset = narrow_queryset(queryset, bitmap_predicates(self.form.cleaned_data))
+        return super().filter_queryset(queryset)
+
+    def filter_breed(self, queryset, name, value):
+        # Substring match, widened to similar breeds when the trigram index is on
+        return queryset.filter(breed_q(value, self.form.cleaned_data.get('species')))
@@ -0,0 +1,174 @@
+"""
+Trigram index for fuzzy breed matching
+
+Every distinct breed stored on a pet, plus the canonical names in
+``apps.pets.breeds``, is indexed by its trigrams. A breed filter such as
+"german shepard" resolves in memory to the exact breed values that
+resemble it, and the database then only sees an indexed ``breed IN (...)``
+lookup. A typo that matches a canonical name also brings in the stored
+breeds resembling that name.
+
+The index is opt-in through the ``PET_FUZZY_BREEDS`` setting. Breed filters
+always keep the plain case-insensitive substring match and only add the
+resolved breeds to it, so a breed the index has not seen yet still matches.
+"""
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import Q
+
+from apps.core.indexing import InMemoryIndex, register
+from .breeds import CANONICAL_BREEDS
+from .models import Pet
+from .signals import PETS_NAMESPACE
+
+
+DEFAULT_THRESHOLD = 0.4
+
+NON_ALNUM_RE = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(text):
+    return ' '.join(NON_ALNUM_RE.sub(' ', (text or '').lower()).split())
+
+
+def trigrams(text):
+    """Trigrams of each word padded like pg_trgm: two leading, one trailing space"""
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a, b):
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def best_window_similarity(query, query_grams, candidate):
+    """Best similarity between the query and any run of as many words in ``candidate``"""
+    words = candidate.split()
+    size = len(query.split())
+    best = similarity(query_grams, trigrams(candidate))
+    for start in range(max(len(words) - size + 1, 0)):
+        window = ' '.join(words[start:start + size])
+        best = max(best, similarity(query_grams, trigrams(window)))
+    return best
+
+
+class BreedTrigramIndex(InMemoryIndex):
+    namespace = PETS_NAMESPACE
+
+    def build(self):
+        # normalized breed -> {'values': Counter((raw breed, species)), 'canonical': set(species)}
+        self._entries = {}
+        self._postings = {}
+        self._pet_breeds = {}
+        for species, names in CANONICAL_BREEDS.items():
+            for name in names:
+                self._entry(normalize(name))['canonical'].add(species)
+        for pk, breed, species in Pet.objects.values_list('pk', 'breed', 'species').iterator():
+            self._add_pet(pk, breed, species)
+
+    def _entry(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = {'values': Counter(), 'canonical': set()}
+            for gram in trigrams(key):
+                self._postings.setdefault(gram, set()).add(key)
+        return entry
+
+    def _add_pet(self, pk, breed, species):
+        key = normalize(breed)
+        if not key:
+            return
+        self._entry(key)['values'][(breed, species)] += 1
+        self._pet_breeds[pk] = (key, breed, species)
+
+    def upsert(self, pet):
+        self.remove(pet.pk)
+        self._add_pet(pet.pk, pet.breed, pet.species)
+
+    def remove(self, pk):
+        previous = self._pet_breeds.pop(pk, None)
+        if previous is None:
+            return
+        key, breed, species = previous
+        entry = self._entries[key]
+        entry['values'][(breed, species)] -= 1
+        if entry['values'][(breed, species)] <= 0:
+            del entry['values'][(breed, species)]
+        if not entry['values'] and not entry['canonical']:
+            del self._entries[key]
+            for gram in trigrams(key):
+                self._postings[gram].discard(key)
+
+    def _matches(self, query, threshold):
+        query_grams = trigrams(query)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self._postings.get(gram, ()))
+
+        matches = set()
+        for key, count in shared.items():
+            if query in key:
+                matches.add(key)
+            elif count >= threshold * len(query_grams):
+                if best_window_similarity(query, query_grams, key) >= threshold:
+                    matches.add(key)
+        return matches
+
+    def resolve(self, text, species=None, threshold=None):
+        """Stored breed values resembling ``text``, optionally for one species"""
+        if threshold is None:
+            threshold = getattr(settings, 'PET_BREED_SIMILARITY_THRESHOLD', DEFAULT_THRESHOLD)
+        query = normalize(text)
+        if not query:
+            return []
+
+        self.ensure_fresh()
+        with self._lock:
+            keys = self._matches(query, threshold)
+            for key in list(keys):
+                canonical = self._entries[key]['canonical']
+                if canonical and (species is None or species in canonical):
+                    keys |= self._matches(key, threshold)
+
+            breeds = set()
+            for key in keys:
+                for breed, breed_species in self._entries[key]['values']:
+                    if species is None or breed_species == species:
+                        breeds.add(breed)
+        return sorted(breeds)
+
+
+breed_index = register(BreedTrigramIndex())
+
+
+def fuzzy_breeds_enabled():
+    return getattr(settings, 'PET_FUZZY_BREEDS', False)
+
+
+def resolve_breeds(text, species=None):
+    """Stored breeds resembling ``text``; none while the index is disabled"""
+    if not fuzzy_breeds_enabled():
+        return []
+    return breed_index.resolve(text, species=species or None)
+
+
+def breed_q(text, species=None):
+    """Pets whose breed contains ``text`` or resembles it"""
+    condition = Q(breed__icontains=text)
+    similar = resolve_breeds(text, species)
+    if similar:
+        condition |= Q(breed__in=similar)
+    return condition
+
+
+def breed_matches(breed, text, species=None):
+    """Python counterpart of ``breed_q`` for a single pet"""
+    return text.lower() in (breed or '').lower() or breed in resolve_breeds(text, species)
@@ -0,0 +1,68 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.pets.catalog import FLAG_COLUMNS, catalog, catalog_enabled, criteria, criteria_q, np
+from apps.pets.models import Pet
+
+
+class Command(BaseCommand):
+    help = 'Compare the in-memory pet catalog against the ORM on random filters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def random_spec(self, rng):
+        equals = {}
+        if rng.random() < 0.6:
+            equals['species'] = rng.choice(Pet.SPECIES_CHOICES)[0]
+        if rng.random() < 0.4:
+            equals['size'] = rng.choice(Pet.SIZE_CHOICES)[0]
+        for flag in rng.sample(FLAG_COLUMNS, rng.randint(0, 3)):
+            equals[flag] = True
+        ranges = {}
+        if rng.random() < 0.5:
+            ranges['age_years'] = (rng.randint(0, 3), rng.randint(4, 15))
+        if rng.random() < 0.3:
+            ranges['adoption_fee'] = (None, rng.choice([50, 100, 250, 500]))
+        return criteria(equals, ranges=ranges)
+
+    def handle(self, *args, **options):
+        if np is None:
+            raise CommandError('NumPy is not installed.')
+        if not catalog_enabled():
+            self.stdout.write('Note: PET_CATALOG_ENGINE is disabled, views still use the ORM.')
+
+        rng = random.Random(options['seed'])
+        specs = [self.random_spec(rng) for _ in range(options['queries'])]
+
+        started = time.perf_counter()
+        catalog.ensure_fresh()
+        build_time = time.perf_counter() - started
+
+        orm_time = catalog_time = 0.0
+        mismatches = 0
+        for spec in specs:
+            started = time.perf_counter()
+            expected = list(
+                Pet.objects.filter(status='available').filter(criteria_q(spec))
+                .order_by('-created_at', '-id').values_list('pk', flat=True)
+            )
+            orm_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            actual = catalog.filter_ids(spec)
+            catalog_time += time.perf_counter() - started
+
+            mismatches += expected != actual
+
+        count = len(specs)
+        self.stdout.write(f'Catalog build:  {build_time * 1000:.1f} ms')
+        self.stdout.write(f'ORM:            {orm_time / count * 1000:.3f} ms/query')
+        self.stdout.write(f'Catalog engine: {catalog_time / count * 1000:.3f} ms/query')
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'{mismatches} of {count} result lists differed'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'All {count} result lists matched'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.pets.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the pet full-text search index from the pets table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        if rebuild_search_index(using=options['database']):
+            self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
+        else:
+            self.stdout.write('Search index is maintained by the database; nothing to rebuild.')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.pets.featured import refresh_featured_pets
+
+
+class Command(BaseCommand):
+    help = 'Precompute the weighted featured pets rotation shown on the home page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, help='Seed the sampler for a reproducible rotation')
+
+    def handle(self, *args, **options):
+        rotation = refresh_featured_pets(seed=options['seed'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {len(rotation['sets'])} featured sets covering {sum(map(len, rotation['sets']))} pets."
+        ))
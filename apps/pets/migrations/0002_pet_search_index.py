@@ -0,0 +1,82 @@
+from django.db import migrations
+
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE pets_pet_fts USING fts5(
+        name, breed, description, personality_traits,
+        content='pets_pet', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER pets_pet_fts_insert AFTER INSERT ON pets_pet BEGIN
+        INSERT INTO pets_pet_fts(rowid, name, breed, description, personality_traits)
+        VALUES (new.id, new.name, new.breed, new.description, new.personality_traits);
+    END
+    """,
+    """
+    CREATE TRIGGER pets_pet_fts_delete AFTER DELETE ON pets_pet BEGIN
+        INSERT INTO pets_pet_fts(pets_pet_fts, rowid, name, breed, description, personality_traits)
+        VALUES ('delete', old.id, old.name, old.breed, old.description, old.personality_traits);
+    END
+    """,
+    """
+    CREATE TRIGGER pets_pet_fts_update
+    AFTER UPDATE OF name, breed, description, personality_traits ON pets_pet BEGIN
+        INSERT INTO pets_pet_fts(pets_pet_fts, rowid, name, breed, description, personality_traits)
+        VALUES ('delete', old.id, old.name, old.breed, old.description, old.personality_traits);
+        INSERT INTO pets_pet_fts(rowid, name, breed, description, personality_traits)
+        VALUES (new.id, new.name, new.breed, new.description, new.personality_traits);
+    END
+    """,
+    "INSERT INTO pets_pet_fts(pets_pet_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS pets_pet_fts_update',
+    'DROP TRIGGER IF EXISTS pets_pet_fts_delete',
+    'DROP TRIGGER IF EXISTS pets_pet_fts_insert',
+    'DROP TABLE IF EXISTS pets_pet_fts',
+]
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE pets_pet ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        to_tsvector('english',
+            coalesce(name, '') || ' ' || coalesce(breed, '') || ' ' ||
+            coalesce(description, '') || ' ' || coalesce(personality_traits, ''))
+    ) STORED
+    """,
+    'CREATE INDEX pets_pet_search_vector_idx ON pets_pet USING GIN (search_vector)',
+]
+
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS pets_pet_search_vector_idx',
+    'ALTER TABLE pets_pet DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def _run(schema_editor, statements):
+    vendor = schema_editor.connection.vendor
+    for sql in statements.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD})
+
+
+def drop_search_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0002_pet_search_index'),
+    ]
+
+    operations = [
+        # Fuzzy breed filters resolve to ``breed IN (...)`` lookups
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS pets_pet_breed_idx ON pets_pet (breed)',
+            'DROP INDEX IF EXISTS pets_pet_breed_idx',
+        ),
+    ]
@@ -0,0 +1,38 @@
+"""
+Query helpers for pet list pages
+"""
+from django.db.models import Prefetch
+
+from .models import PetImage
+
+
+# Heavy text columns that list pages never display
+LIST_DEFERRED_FIELDS = ('description', 'personality_traits', 'medical_notes', 'special_needs')
+
+
+def main_image_prefetch(lookup='images'):
+    """
+    Prefetch a single image per pet into ``main_images``, the primary one when
+    it exists, using the same ordering as ``PetImage.Meta.ordering``.
+    """
+    return Prefetch(
+        lookup,
+        queryset=PetImage.objects.order_by('-is_primary', 'uploaded_at')[:1],
+        to_attr='main_images'
+    )
+
+
+def with_list_projection(queryset, prefix=''):
+    """
+    Apply the lean projection used for pet list serialization.
+
+    ``prefix`` points at the pet relation when ``queryset`` is over another
+    model, e.g. ``'pet__'`` for adoption applications.
+    """
+    return queryset.select_related(
+        f'{prefix}shelter__shelter_profile'
+    ).defer(
+        *(f'{prefix}{field}' for field in LIST_DEFERRED_FIELDS)
+    ).prefetch_related(
+        main_image_prefetch(f'{prefix}images')
+    )
@@ -0,0 +1,185 @@
+"""
+Relevance ranking for pet search (BM25F)
+
+Each term of an available pet's name, breed, description and personality
+traits gets a precomputed BM25F impact, with name and breed weighted above
+the free-text fields. Postings lists are kept sorted by impact, so top-k
+retrieval uses the threshold algorithm. It walks the lists in parallel and
+stops as soon as no unseen pet can beat the current k-th score, so large
+result sets are never fully scored or sorted.
+"""
+import heapq
+import math
+from bisect import bisect_left, insort
+
+from django.conf import settings
+
+from apps.core.indexing import InMemoryIndex, register
+from .models import Pet
+from .search import tokenize
+from .signals import PETS_NAMESPACE
+
+
+DEFAULT_FIELD_WEIGHTS = {
+    'name': 3.0,
+    'breed': 2.5,
+    'description': 1.0,
+    'personality_traits': 1.0,
+}
+
+K1 = 1.2
+B = 0.75
+
+
+class RelevanceIndex(InMemoryIndex):
+    namespace = PETS_NAMESPACE
+
+    @property
+    def field_weights(self):
+        return getattr(settings, 'PET_SEARCH_FIELD_WEIGHTS', DEFAULT_FIELD_WEIGHTS)
+
+    def build(self):
+        self._postings = {}
+        self._impacts = {}
+        self._pet_terms = {}
+        rows = list(
+            Pet.objects.filter(status='available')
+            .values_list('pk', *self.field_weights)
+            .iterator()
+        )
+        documents = [
+            (row[0], {field: tokenize(text) for field, text in zip(self.field_weights, row[1:])})
+            for row in rows
+        ]
+        # Average field lengths are frozen at build time so impacts stay
+        # comparable as pets are added and removed incrementally
+        count = max(len(documents), 1)
+        self._average_lengths = {
+            field: max(sum(len(fields[field]) for _, fields in documents) / count, 1.0)
+            for field in self.field_weights
+        }
+        self._document_count = len(documents)
+        for pk, fields in documents:
+            self._add(pk, fields)
+
+    def _add(self, pk, fields):
+        weighted = {}
+        for field, weight in self.field_weights.items():
+            tokens = fields[field]
+            if not tokens:
+                continue
+            norm = 1 - B + B * len(tokens) / self._average_lengths[field]
+            for token in tokens:
+                weighted[token] = weighted.get(token, 0.0) + weight / norm
+
+        for term, frequency in weighted.items():
+            impact = frequency / (K1 + frequency)
+            self._impacts.setdefault(term, {})[pk] = impact
+            insort(self._postings.setdefault(term, []), (-impact, pk))
+        self._pet_terms[pk] = list(weighted)
+
+    def upsert(self, pet):
+        self.remove(pet.pk)
+        if pet.status == 'available':
+            fields = {field: tokenize(getattr(pet, field)) for field in self.field_weights}
+            self._add(pet.pk, fields)
+            self._document_count += 1
+
+    def remove(self, pk):
+        terms = self._pet_terms.pop(pk, None)
+        if terms is None:
+            return
+        self._document_count -= 1
+        for term in terms:
+            impact = self._impacts[term].pop(pk)
+            postings = self._postings[term]
+            del postings[bisect_left(postings, (-impact, pk))]
+            if not postings:
+                del self._postings[term]
+                del self._impacts[term]
+
+    def _idf(self, term):
+        frequency = len(self._impacts.get(term, ()))
+        return math.log(1 + (self._document_count - frequency + 0.5) / (frequency + 0.5))
+
+    def _query_terms(self, text):
+        return [term for term in dict.fromkeys(tokenize(text)) if term in self._postings]
+
+    def match_count(self, text, allowed=None):
+        """Number of pets containing at least one query term"""
+        self.ensure_fresh()
+        with self._lock:
+            matches = set()
+            for term in self._query_terms(text):
+                matches.update(self._impacts[term])
+        if allowed is not None:
+            matches &= allowed
+        return len(matches)
+
+    def top_k(self, text, k, allowed=None):
+        """
+        IDs of the ``k`` best-scoring pets for ``text``, best first.
+
+        ``allowed`` optionally restricts results to a set of pet IDs.
+        """
+        self.ensure_fresh()
+        with self._lock:
+            terms = [(term, self._idf(term)) for term in self._query_terms(text)]
+            if not terms or k <= 0:
+                return []
+
+            best = []
+            seen = set()
+            depth = 0
+            while True:
+                threshold = 0.0
+                exhausted = True
+                for term, idf in terms:
+                    postings = self._postings[term]
+                    if depth >= len(postings):
+                        continue
+                    exhausted = False
+                    negative_impact, pk = postings[depth]
+                    threshold -= idf * negative_impact
+                    if pk in seen:
+                        continue
+                    seen.add(pk)
+                    if allowed is not None and pk not in allowed:
+                        continue
+                    score = sum(idf_u * self._impacts[u].get(pk, 0.0) for u, idf_u in terms)
+                    entry = (score, -pk)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+
+                if exhausted:
+                    break
+                # No unseen pet can score above the sum of the current impacts
+                if len(best) == k and best[0][0] >= threshold:
+                    break
+                depth += 1
+
+        return [-negative_pk for _, negative_pk in sorted(best, reverse=True)]
+
+
+relevance_index = register(RelevanceIndex())
+
+
+class RankedResults:
+    """
+    Lazily ranked search hits that Django's Paginator can slice; only the
+    pets up to the end of the requested page are ever scored.
+    """
+
+    def __init__(self, text, allowed=None):
+        self.text = text
+        self.allowed = allowed
+
+    def __len__(self):
+        return relevance_index.match_count(self.text, self.allowed)
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return relevance_index.top_k(self.text, key + 1, self.allowed)[key]
+        return relevance_index.top_k(self.text, key.stop, self.allowed)[key]
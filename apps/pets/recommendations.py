@@ -0,0 +1,213 @@
+"""
+"Recommended for you" ranking of available pets for adopters
+
+An ``AdopterProfile`` is turned into a small set of weighted preferences
+(size, age, household fit and the good_with_* / house_trained flags). Every
+available pet is scored against them, in vectorized batches over the catalog
+columns when the ``PET_CATALOG_ENGINE`` is enabled and one row at a time from
+the database otherwise. Each adopter's top pets are kept in process memory and patched as
+individual pets are saved or deleted, so a repeat request does no scoring
+at all. The profile fingerprint is part of the cache key, so editing the
+profile recomputes the list on the next request.
+"""
+import heapq
+import re
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from apps.core.cache_utils import fingerprint
+from apps.core.indexing import InMemoryIndex, register
+from .catalog import catalog, catalog_enabled
+from .models import Pet
+from .signals import PETS_NAMESPACE
+
+
+SIZE_WEIGHT = 3.0
+AGE_WEIGHT = 2.0
+SMALL_SPACE_PENALTY = 1.5
+STRONG_FLAG_WEIGHT = 2.0
+WEAK_FLAG_WEIGHT = 0.5
+
+LARGE_SIZES = ('large', 'extra_large')
+
+AGE_KEYWORDS = {
+    'baby': (0, 1), 'puppy': (0, 1), 'kitten': (0, 1),
+    'young': (0, 3), 'adult': (2, 8), 'senior': (8, 30),
+}
+
+SCORED_COLUMNS = ('size', 'age_years', 'good_with_kids', 'good_with_dogs', 'good_with_cats', 'house_trained')
+
+# Pets scored per vectorized pass
+BATCH_SIZE = 4096
+
+# Adopters whose recommendations are kept in memory per process
+MAX_CACHED_ADOPTERS = 1000
+
+DEFAULT_LIMIT = 12
+MAX_LIMIT = 50
+
+
+def _preferred_sizes(text):
+    text = (text or '').lower().replace('-', ' ')
+    sizes = []
+    if 'extra' in text or 'xl' in text.split():
+        sizes.append('extra_large')
+    for size in ('small', 'medium', 'large'):
+        if re.search(rf'(?<!extra ){size}', text):
+            sizes.append(size)
+    return sizes
+
+
+def _preferred_ages(text):
+    text = (text or '').lower()
+    numbers = [int(number) for number in re.findall(r'\d+', text)]
+    if numbers:
+        return (min(numbers), max(numbers)) if len(numbers) > 1 else (numbers[0], numbers[0])
+    ranges = [bounds for keyword, bounds in AGE_KEYWORDS.items() if keyword in text]
+    if not ranges:
+        return None
+    return min(low for low, _ in ranges), max(high for _, high in ranges)
+
+
+def preferences(profile):
+    """Weighted preferences derived from an ``AdopterProfile``"""
+    other_pets = (profile.other_pets_description or '').lower()
+    mentions = [kind for kind in ('dog', 'cat') if kind in other_pets]
+    if profile.has_other_pets and not mentions:
+        mentions = ['dog', 'cat']
+
+    flags = {
+        # Households of three or more are likely to include children
+        'good_with_kids': STRONG_FLAG_WEIGHT if profile.household_members > 2 else WEAK_FLAG_WEIGHT,
+        'good_with_dogs': STRONG_FLAG_WEIGHT if 'dog' in mentions else 0.0,
+        'good_with_cats': STRONG_FLAG_WEIGHT if 'cat' in mentions else 0.0,
+        'house_trained': (STRONG_FLAG_WEIGHT if profile.housing_type in ('apartment', 'condo')
+                          else WEAK_FLAG_WEIGHT),
+    }
+    return {
+        'sizes': _preferred_sizes(profile.preferred_pet_size),
+        'ages': _preferred_ages(profile.preferred_pet_age),
+        'small_space': profile.housing_type in ('apartment', 'condo') and not profile.has_yard,
+        'flags': {flag: weight for flag, weight in flags.items() if weight},
+    }
+
+
+def score_pet(prefs, values):
+    """Score of one pet, given a mapping of its ``SCORED_COLUMNS``"""
+    score = 0.0
+    if prefs['sizes'] and values['size'] in prefs['sizes']:
+        score += SIZE_WEIGHT
+    if prefs['small_space'] and values['size'] in LARGE_SIZES:
+        score -= SMALL_SPACE_PENALTY
+    if prefs['ages'] and prefs['ages'][0] <= values['age_years'] <= prefs['ages'][1]:
+        score += AGE_WEIGHT
+    for flag, weight in prefs['flags'].items():
+        if values[flag]:
+            score += weight
+    return score
+
+
+def score_columns(prefs, columns):
+    """Vectorized ``score_pet`` over row-aligned column arrays"""
+    scores = np.zeros(len(columns['size']), dtype=np.float64)
+    if prefs['sizes']:
+        scores += SIZE_WEIGHT * np.isin(columns['size'], prefs['sizes'])
+    if prefs['small_space']:
+        scores -= SMALL_SPACE_PENALTY * np.isin(columns['size'], LARGE_SIZES)
+    if prefs['ages']:
+        low, high = prefs['ages']
+        ages = columns['age_years']
+        scores += AGE_WEIGHT * ((ages >= low) & (ages <= high))
+    for flag, weight in prefs['flags'].items():
+        scores += weight * columns[flag]
+    return scores
+
+
+def _rank_all(prefs, count):
+    """(score, pet ID) of the ``count`` best available pets, best first"""
+    if not catalog_enabled():
+        # Don't build and maintain the catalog in every worker just for this
+        rows = Pet.objects.filter(status='available').values('pk', *SCORED_COLUMNS)
+        return heapq.nlargest(count, ((score_pet(prefs, row), row['pk']) for row in rows.iterator()))
+
+    ids, columns = catalog.columns(SCORED_COLUMNS)
+    best_scores = []
+    best_ids = []
+    for start in range(0, len(ids), BATCH_SIZE):
+        batch_ids = ids[start:start + BATCH_SIZE]
+        batch = {name: values[start:start + BATCH_SIZE] for name, values in columns.items()}
+        scores = score_columns(prefs, batch)
+        # Highest score first; newer (higher) IDs win ties
+        order = np.lexsort((-batch_ids, -scores))[:count]
+        best_scores.append(scores[order])
+        best_ids.append(batch_ids[order])
+    if not best_ids:
+        return []
+
+    scores = np.concatenate(best_scores)
+    ids = np.concatenate(best_ids)
+    order = np.lexsort((-ids, -scores))[:count]
+    return list(zip(scores[order].tolist(), ids[order].tolist()))
+
+
+class RecommendationIndex(InMemoryIndex):
+    namespace = PETS_NAMESPACE
+
+    def build(self):
+        # (user ID, preferences fingerprint) -> {'prefs', 'size', 'complete', 'ranked'}
+        # where ``ranked`` holds the best (score, pet ID) pairs, best first, and
+        # ``complete`` means every available pet fit in it
+        self._results = OrderedDict()
+
+    def upsert(self, pet):
+        self.remove(pet.pk)
+        if pet.status != 'available':
+            return
+        values = {column: getattr(pet, column) for column in SCORED_COLUMNS}
+        for entry in self._results.values():
+            ranked = entry['ranked']
+            candidate = (score_pet(entry['prefs'], values), pet.pk)
+            # A pet outranking the last entry belongs in the list; anything
+            # lower may sit behind unseen pets unless the list holds them all
+            if entry['complete'] or (ranked and candidate > ranked[-1]):
+                ranked.append(candidate)
+                ranked.sort(reverse=True)
+                if len(ranked) > entry['size']:
+                    del ranked[entry['size']:]
+                    entry['complete'] = False
+
+    def remove(self, pk):
+        # Dropping a pet leaves the rest a valid, shorter top list
+        for entry in self._results.values():
+            entry['ranked'] = [item for item in entry['ranked'] if item[1] != pk]
+
+    def recommend(self, profile, limit=DEFAULT_LIMIT):
+        """IDs of the pets best matching ``profile``, best first"""
+        limit = max(1, min(limit, MAX_LIMIT))
+        prefs = preferences(profile)
+        key = (profile.user_id, fingerprint(prefs))
+
+        self.ensure_fresh(consistent=False)
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None or (len(entry['ranked']) < limit and not entry['complete']):
+                # Keep a margin so a few removals don't force a rescore
+                size = limit * 2
+                ranked = _rank_all(prefs, size)
+                entry = {'prefs': prefs, 'size': size, 'complete': len(ranked) < size, 'ranked': ranked}
+                self._results[key] = entry
+                while len(self._results) > MAX_CACHED_ADOPTERS:
+                    self._results.popitem(last=False)
+            self._results.move_to_end(key)
+            return [pk for _, pk in entry['ranked'][:limit]]
+
+
+recommendation_index = register(RecommendationIndex())
+
+
+def recommend_pets(profile, limit=DEFAULT_LIMIT):
+    return recommendation_index.recommend(profile, limit)
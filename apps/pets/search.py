@@ -0,0 +1,123 @@
+"""
+Full-text search over the pet catalog
+
+SQLite uses the ``pets_pet_fts`` FTS5 table and PostgreSQL the generated
+``search_vector`` column, both created by migration ``0002_pet_search_index``
+and kept in sync by the database on every insert, update and delete.
+Other backends fall back to ``icontains`` matching.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q, Value, FloatField, BooleanField
+from django.db.models.expressions import RawSQL
+
+from apps.core.cache_utils import fingerprint, versioned_key
+from .signals import PETS_NAMESPACE, PET_IMAGES_NAMESPACE
+
+
+SEARCH_FIELDS = ['name', 'breed', 'description', 'personality_traits']
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """Split free text into lowercase search tokens"""
+    return [token.lower() for token in TOKEN_RE.findall(text or '')]
+
+
+def _fts5_query(tokens):
+    # Every token must match, each one as a prefix so "lab" finds "labrador"
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _tsquery(tokens):
+    return ' & '.join(f'{token}:*' for token in tokens)
+
+
+def full_text_search(queryset, text):
+    """
+    Restrict a Pet queryset to full-text matches for ``text``.
+
+    The queryset is annotated with ``search_rank`` (higher is more relevant)
+    so callers can order by it.
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'sqlite':
+        match = _fts5_query(tokens)
+        return queryset.filter(
+            pk__in=RawSQL(
+                'SELECT rowid FROM pets_pet_fts WHERE pets_pet_fts MATCH %s',
+                (match,)
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                'SELECT -rank FROM pets_pet_fts '
+                'WHERE pets_pet_fts MATCH %s AND rowid = pets_pet.id',
+                (match,),
+                output_field=FloatField()
+            )
+        )
+
+    if vendor == 'postgresql':
+        tsquery = _tsquery(tokens)
+        return queryset.filter(
+            RawSQL(
+                "pets_pet.search_vector @@ to_tsquery('english', %s)",
+                (tsquery,),
+                output_field=BooleanField()
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                "ts_rank(pets_pet.search_vector, to_tsquery('english', %s))",
+                (tsquery,),
+                output_field=FloatField()
+            )
+        )
+
+    condition = Q()
+    for token in tokens:
+        token_match = Q()
+        for field in SEARCH_FIELDS:
+            token_match |= Q(**{f'{field}__icontains': token})
+        condition &= token_match
+    return queryset.filter(condition).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
+
+
+def search_cache_key(filters, page, page_size):
+    """
+    Cache key for one page of ``search_pets`` results.
+
+    Empty filters are dropped and free-text values lowercased so equivalent
+    searches share an entry. The key changes whenever a pet, a pet image or
+    a shelter's location changes.
+    """
+    normalized = {}
+    for name, value in filters.items():
+        if value is None or value == '':
+            continue
+        if name in ('query', 'breed', 'location'):
+            value = ' '.join(value.lower().split())
+        normalized[name] = value
+    return versioned_key(
+        [PETS_NAMESPACE, PET_IMAGES_NAMESPACE],
+        'search', fingerprint(normalized), page, page_size
+    )
+
+
+def rebuild_search_index(using='default'):
+    """Rebuild the full-text index from the pets table"""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        # The PostgreSQL column is generated, so it can never drift
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO pets_pet_fts(pets_pet_fts) VALUES('rebuild')")
+    return True
@@ -0,0 +1,37 @@
+"""
+Signal handlers keeping pet-derived caches and indexes in sync with the catalog
+"""
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.core.cache_utils import bump_version
+from apps.core.indexing import publish_change
+from .models import Pet, PetImage
+
+
+PETS_NAMESPACE = 'pets'
+PET_IMAGES_NAMESPACE = 'pet_images'
+
+
+@receiver(pre_save, sender=Pet)
+def remember_pet_status(sender, instance, **kwargs):
+    # Lets post_save handlers tell status transitions from other edits
+    instance._previous_status = None
+    if instance.pk:
+        instance._previous_status = Pet.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+
+@receiver(post_save, sender=Pet)
+def pet_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: publish_change(PETS_NAMESPACE, instance))
+
+
+@receiver(post_delete, sender=Pet)
+def pet_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: publish_change(PETS_NAMESPACE, instance, deleted=True))
+
+
+@receiver([post_save, post_delete], sender=PetImage)
+def pet_image_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_version(PET_IMAGES_NAMESPACE))
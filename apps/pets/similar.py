@@ -0,0 +1,132 @@
+"""
+"Similar pets" nearest-neighbour index
+
+Every available pet has a precomputed feature vector: species and
+normalized breed as categorical codes, plus scaled size, age, adoption fee
+and the behaviour flags. Neighbours are found by a brute-force, vectorized
+weighted distance over the whole matrix, which is fast enough for a
+catalog of tens of thousands of pets. Pet saves and deletions patch the
+vectors; the matrix is reassembled lazily on the next lookup.
+"""
+import heapq
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from apps.core.indexing import InMemoryIndex, register
+from .fuzzy import normalize as normalize_breed
+from .models import Pet
+from .signals import PETS_NAMESPACE
+
+
+FEATURE_FIELDS = (
+    'species', 'breed', 'size', 'age_years', 'adoption_fee',
+    'good_with_kids', 'good_with_dogs', 'good_with_cats',
+    'house_trained', 'is_spayed_neutered', 'is_vaccinated',
+)
+
+SIZE_ORDINALS = {'small': 0.0, 'medium': 1.0, 'large': 2.0, 'extra_large': 3.0}
+
+# Penalties for a categorical mismatch
+SPECIES_WEIGHT = 4.0
+BREED_WEIGHT = 1.5
+
+# Weights of the squared differences of the scaled numeric features:
+# size, age, fee, then the six flags
+NUMERIC_WEIGHTS = (1.0, 1.0, 0.5) + (0.25,) * 6
+
+MAX_AGE_YEARS = 15.0
+MAX_FEE = 500.0
+
+DEFAULT_LIMIT = 6
+MAX_LIMIT = 24
+
+
+def feature_vector(values):
+    """(species, breed key, numeric features) of a mapping of ``FEATURE_FIELDS``"""
+    numeric = (
+        SIZE_ORDINALS.get(values['size'], 1.0) / 3,
+        min(float(values['age_years'] or 0), MAX_AGE_YEARS) / MAX_AGE_YEARS,
+        min(float(values['adoption_fee'] or 0), MAX_FEE) / MAX_FEE,
+        *(float(bool(values[flag])) for flag in FEATURE_FIELDS[5:]),
+    )
+    return values['species'], normalize_breed(values['breed']), numeric
+
+
+def distance(a, b):
+    species_a, breed_a, numeric_a = a
+    species_b, breed_b, numeric_b = b
+    total = SPECIES_WEIGHT * (species_a != species_b) + BREED_WEIGHT * (breed_a != breed_b)
+    return total + sum(w * (x - y) ** 2 for w, x, y in zip(NUMERIC_WEIGHTS, numeric_a, numeric_b))
+
+
+class SimilarPetsIndex(InMemoryIndex):
+    namespace = PETS_NAMESPACE
+
+    def build(self):
+        self._vectors = {}
+        self._arrays = None
+        rows = Pet.objects.filter(status='available').values('pk', *FEATURE_FIELDS)
+        for row in rows.iterator():
+            self._vectors[row['pk']] = feature_vector(row)
+
+    def upsert(self, pet):
+        self.remove(pet.pk)
+        if pet.status == 'available':
+            self._vectors[pet.pk] = feature_vector({field: getattr(pet, field) for field in FEATURE_FIELDS})
+            self._arrays = None
+
+    def remove(self, pk):
+        if self._vectors.pop(pk, None) is not None:
+            self._arrays = None
+
+    def _matrix(self):
+        if self._arrays is None:
+            ids = list(self._vectors)
+            vectors = [self._vectors[pk] for pk in ids]
+            self._arrays = (
+                np.array(ids, dtype=np.int64),
+                np.array([species for species, _, _ in vectors], dtype=object),
+                np.array([breed for _, breed, _ in vectors], dtype=object),
+                np.array([numeric for _, _, numeric in vectors], dtype=np.float64).reshape(
+                    len(vectors), len(NUMERIC_WEIGHTS)
+                ),
+            )
+        return self._arrays
+
+    def nearest(self, pet, limit=DEFAULT_LIMIT):
+        """IDs of the available pets closest to ``pet``, closest first"""
+        limit = max(1, min(limit, MAX_LIMIT))
+        target = feature_vector({field: getattr(pet, field) for field in FEATURE_FIELDS})
+
+        self.ensure_fresh(consistent=False)
+        with self._lock:
+            if np is None:
+                candidates = ((distance(target, vector), pk) for pk, vector in self._vectors.items()
+                              if pk != pet.pk)
+                return [pk for _, pk in heapq.nsmallest(limit, candidates)]
+
+            ids, species, breeds, numeric = self._matrix()
+            if not len(ids):
+                return []
+            species_target, breed_target, numeric_target = target
+            distances = (
+                SPECIES_WEIGHT * (species != species_target)
+                + BREED_WEIGHT * (breeds != breed_target)
+                + ((numeric - np.array(numeric_target)) ** 2) @ np.array(NUMERIC_WEIGHTS)
+            ).astype(np.float64)
+            distances[ids == pet.pk] = np.inf
+
+            count = min(limit, len(ids))
+            nearest = np.argpartition(distances, count - 1)[:count]
+            nearest = nearest[np.lexsort((ids[nearest], distances[nearest]))]
+            return [int(ids[row]) for row in nearest if np.isfinite(distances[row])]
+
+
+similar_pets_index = register(SimilarPetsIndex())
+
+
+def similar_pets(pet, limit=DEFAULT_LIMIT):
+    return similar_pets_index.nearest(pet, limit)
@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.pets.featured import FEATURED_COUNT, featured_pet_ids, featured_pets, refresh_featured_pets
+from apps.pets.models import Pet
+from apps.users.models import User
+
+
+class FeaturedPetsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        shelter = User.objects.create_user(username='shelter', password='x', user_type='shelter')
+        for index in range(FEATURED_COUNT + 3):
+            Pet.objects.create(
+                name=f'pet{index}', species='dog' if index % 2 else 'cat', breed='Mixed',
+                age_years=2, age_months=0, gender='female', size='small', weight=Decimal('10.0'),
+                color='Black', shelter=shelter, description='Friendly', adoption_fee=Decimal('50.00'),
+            )
+        refresh_featured_pets(seed=1)
+
+    def test_adopted_pets_are_replaced_from_the_following_sets(self):
+        adopted = featured_pet_ids()[:2]
+        Pet.objects.filter(pk__in=adopted).update(status='adopted')
+
+        pets = featured_pets()
+        self.assertEqual(len(pets), FEATURED_COUNT)
+        self.assertTrue(all(isinstance(pet, Pet) and pet.pk not in adopted for pet in pets))
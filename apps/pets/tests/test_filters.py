@@ -0,0 +1,33 @@
+from django.http import QueryDict
+from django.db.models import Q
+from django.test import SimpleTestCase, override_settings
+
+from apps.pets.filters import FlagCheckboxInput, PetFilter
+from apps.pets.fuzzy import breed_matches, breed_q
+from apps.pets.models import Pet
+
+
+class FlagCheckboxInputTests(SimpleTestCase):
+    def test_absent_box_is_no_filter(self):
+        self.assertIsNone(FlagCheckboxInput().value_from_datadict(QueryDict(''), {}, 'good_with_kids'))
+
+    def test_ticked_box_requires_the_trait(self):
+        data = QueryDict('good_with_kids=on')
+        self.assertIs(FlagCheckboxInput().value_from_datadict(data, {}, 'good_with_kids'), True)
+
+    def test_unfiltered_sidebar_has_no_flag_predicates(self):
+        filterset = PetFilter(QueryDict('species=dog'), queryset=Pet.objects.none())
+        self.assertTrue(filterset.is_valid())
+        for flag in ('good_with_kids', 'good_with_dogs', 'good_with_cats',
+                     'house_trained', 'is_spayed_neutered', 'is_vaccinated'):
+            self.assertIsNone(filterset.form.cleaned_data[flag])
+
+
+@override_settings(PET_FUZZY_BREEDS=False)
+class BreedFilterTests(SimpleTestCase):
+    def test_substring_match_without_the_trigram_index(self):
+        self.assertEqual(breed_q('shepherd'), Q(breed__icontains='shepherd'))
+
+    def test_unindexed_breed_still_matches(self):
+        self.assertTrue(breed_matches('Czechoslovakian Wolfdog', 'wolfdog', 'dog'))
+        self.assertFalse(breed_matches('Beagle', 'wolfdog', 'dog'))
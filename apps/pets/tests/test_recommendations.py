@@ -0,0 +1,27 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from apps.pets.models import Pet
+from apps.pets.recommendations import _rank_all
+from apps.users.models import User
+
+
+@override_settings(PET_CATALOG_ENGINE=False)
+class RankAllTests(TestCase):
+    def setUp(self):
+        shelter = User.objects.create_user(username='shelter', password='x', user_type='shelter')
+        for name, size in (('Tiny', 'small'), ('Bruno', 'large')):
+            Pet.objects.create(
+                name=name, species='dog', breed='Mixed', age_years=2, age_months=0,
+                gender='male', size=size, weight=Decimal('20.0'), color='Brown',
+                shelter=shelter, description='Friendly', adoption_fee=Decimal('50.00'),
+            )
+
+    @mock.patch('apps.pets.recommendations.catalog')
+    def test_ranks_from_the_database_without_the_catalog(self, catalog):
+        prefs = {'sizes': ['small'], 'small_space': False, 'ages': None, 'flags': {}}
+        ranked = _rank_all(prefs, 2)
+        catalog.columns.assert_not_called()
+        self.assertEqual(Pet.objects.get(pk=ranked[0][1]).name, 'Tiny')
@@ -3,15 +3,26 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+from django.views.generic.list import MultipleObjectMixin
+from django.db import transaction
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.db.models import Q
 from django_filters.views import FilterView
+from apps.core.page_cache import anonymous_page_cache
+from apps.core.pagination import KeysetPaginationMixin
 from .models import Pet, PetImage, PetFavorite
 from .forms import PetForm, PetImageFormSet, PetSearchForm
 from .filters import PetFilter
+from .facets import get_facets
+from .catalog import catalog, catalog_enabled, criteria_from_filterset, hydrate
+from .querysets import with_list_projection
+from .signals import PETS_NAMESPACE, PET_IMAGES_NAMESPACE
+from .similar import similar_pets
 
 
-class PetListView(FilterView):
+@method_decorator(anonymous_page_cache([PETS_NAMESPACE, PET_IMAGES_NAMESPACE]), name='dispatch')
+class PetListView(KeysetPaginationMixin, FilterView):
     model = Pet
     template_name = 'pets/pet_list.html'
     context_object_name = 'pets'
@@ -20,6 +31,29 @@ class PetListView(FilterView):
     
     def get_queryset(self):
         return Pet.objects.filter(status='available').select_related('shelter').prefetch_related('images')
+    
+    def paginate_queryset(self, queryset, page_size):
+        use_catalog = (
+            catalog_enabled()
+            and self.cursor_param not in self.request.GET
+            and self.filterset.is_valid()
+        )
+        if not use_catalog:
+            return super().paginate_queryset(queryset, page_size)
+        
+        # Filter in the in-memory catalog, then load only the page rows
+        pet_ids = catalog.filter_ids(criteria_from_filterset(self.filterset.form.cleaned_data))
+        paginator, page, page_ids, is_paginated = MultipleObjectMixin.paginate_queryset(
+            self, pet_ids, page_size
+        )
+        page.object_list = hydrate(page_ids, self.get_queryset())
+        return (paginator, page, page.object_list, is_paginated)
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.filterset.is_valid():
+            context['facets'] = get_facets(self.filterset)
+        return context
 
 
 class PetDetailView(DetailView):
@@ -34,6 +68,9 @@ class PetDetailView(DetailView):
                 user=self.request.user, 
                 pet=self.object
             ).exists()
+        context['similar_pets'] = hydrate(
+            similar_pets(self.object), with_list_projection(Pet.objects.all())
+        )
         return context
 
 
@@ -63,9 +100,10 @@ class PetCreateView(LoginRequiredMixin, CreateView):
         form.instance.shelter = self.request.user
         
         if form.is_valid() and image_formset.is_valid():
-            self.object = form.save()
-            image_formset.instance = self.object
-            image_formset.save()
+            with transaction.atomic():
+                self.object = form.save()
+                image_formset.instance = self.object
+                image_formset.save()
             messages.success(self.request, f'{self.object.name} has been added successfully!')
             return redirect(self.object.get_absolute_url())
         else:
@@ -101,8 +139,9 @@ class PetUpdateView(LoginRequiredMixin, UpdateView):
         image_formset = context['image_formset']
         
         if form.is_valid() and image_formset.is_valid():
-            self.object = form.save()
-            image_formset.save()
+            with transaction.atomic():
+                self.object = form.save()
+                image_formset.save()
             messages.success(self.request, f'{self.object.name} has been updated successfully!')
             return redirect(self.object.get_absolute_url())
         else:
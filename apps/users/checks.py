@@ -0,0 +1,19 @@
+"""
+System checks for the users app
+"""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def zip_centroids_check(app_configs, **kwargs):
+    if getattr(settings, 'ZIP_CENTROIDS_FILE', None):
+        return []
+    return [Warning(
+        'ZIP_CENTROIDS_FILE is not set; geocoding uses the bundled sample of major US cities.',
+        hint=(
+            'Shelters outside it are never geocoded and radius searches from unknown ZIP codes '
+            'are not limited by distance. Point ZIP_CENTROIDS_FILE at a full ZCTA centroid table.'
+        ),
+        id='users.W001',
+    )]
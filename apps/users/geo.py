@@ -0,0 +1,160 @@
+"""
+Offline geocoding and radius search for shelters
+
+Shelters are geocoded from their ZIP code (or city and state) against a ZIP
+centroid table shipped with the app. ``data/zip_centroids.csv`` covers major
+US cities; point the ``ZIP_CENTROIDS_FILE`` setting at a full table with the
+same columns (e.g. built from the Census ZCTA gazetteer) in production; the
+``users.W001`` check warns until it is set. A search near a ZIP code the table
+doesn't know is not limited by distance.
+
+Coordinates are stored with a geohash, so a radius query becomes a handful
+of indexed prefix range lookups followed by an exact distance check.
+"""
+import csv
+import math
+import os
+from functools import lru_cache
+
+from django.conf import settings
+
+from .models import User
+
+
+DEFAULT_ZIP_CENTROIDS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'zip_centroids.csv')
+
+EARTH_RADIUS_MILES = 3958.8
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+
+# Approximate (width, height) of a geohash cell in miles at the equator, by
+# precision; widths shrink with the cosine of the latitude
+GEOHASH_CELL_MILES = {
+    1: (3107.0, 3107.0),
+    2: (777.0, 388.0),
+    3: (97.0, 97.0),
+    4: (24.3, 12.1),
+    5: (3.04, 3.04),
+    6: (0.76, 0.38),
+}
+
+
+@lru_cache(maxsize=1)
+def _centroids():
+    path = getattr(settings, 'ZIP_CENTROIDS_FILE', DEFAULT_ZIP_CENTROIDS_FILE)
+    by_zip = {}
+    by_city = {}
+    with open(path, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            point = (float(row['latitude']), float(row['longitude']))
+            by_zip[row['zip_code'].strip()] = point
+            city_key = (row['city'].strip().lower(), row['state'].strip().lower())
+            by_city.setdefault(city_key, []).append(point)
+    # A city spanning several ZIPs is placed at the mean of their centroids
+    by_city = {
+        key: (sum(lat for lat, _ in points) / len(points), sum(lng for _, lng in points) / len(points))
+        for key, points in by_city.items()
+    }
+    return by_zip, by_city
+
+
+def geocode(zip_code='', city='', state=''):
+    """(latitude, longitude) of a ZIP code, else of a city and state, else None"""
+    by_zip, by_city = _centroids()
+    zip_code = (zip_code or '').strip()[:5]
+    if zip_code in by_zip:
+        return by_zip[zip_code]
+    if city and state:
+        return by_city.get((city.strip().lower(), state.strip().lower()))
+    return None
+
+
+def haversine_miles(a, b):
+    lat1, lng1 = map(math.radians, a)
+    lat2, lng2 = map(math.radians, b)
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(h))
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = bit_count = 0
+    return ''.join(chars)
+
+
+def _cell_size_degrees(precision):
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def covering_cells(center, radius_miles):
+    """
+    Geohash cells covering a circle: the center cell and its neighbours at
+    the finest precision whose cells are at least as large as the radius.
+    """
+    latitude, longitude = center
+    # Cells narrow towards the poles; measure them across the circle's widest
+    # latitude so the neighbours still reach the radius there
+    widest = min(abs(latitude) + math.degrees(radius_miles / EARTH_RADIUS_MILES), 90.0)
+    shrink = math.cos(math.radians(widest))
+    precision = 1
+    for candidate, (width, height) in sorted(GEOHASH_CELL_MILES.items()):
+        if min(width * shrink, height) >= radius_miles:
+            precision = candidate
+
+    lat_step, lng_step = _cell_size_degrees(precision)
+    cells = set()
+    for d_lat in (-1, 0, 1):
+        for d_lng in (-1, 0, 1):
+            lat = max(-89.999999, min(89.999999, latitude + d_lat * lat_step))
+            lng = (longitude + d_lng * lng_step + 180.0) % 360.0 - 180.0
+            cells.add(geohash_encode(lat, lng, precision))
+    return sorted(cells)
+
+
+def nearby_shelters(center, radius_miles):
+    """Map of shelter ID to distance in miles for shelters within the radius"""
+    distances = {}
+    for cell in covering_cells(center, radius_miles):
+        # A prefix match written as a range so any B-tree index on geohash is used
+        shelters = User.objects.filter(
+            user_type='shelter', geohash__gte=cell, geohash__lt=cell + '~'
+        ).values_list('pk', 'latitude', 'longitude')
+        for pk, latitude, longitude in shelters:
+            distance = haversine_miles(center, (latitude, longitude))
+            if distance <= radius_miles:
+                distances[pk] = distance
+    return distances
+
+
+def geocode_user(user):
+    """Store the coordinates and geohash of ``user``'s address"""
+    point = geocode(user.zip_code, user.city, user.state)
+    if point is None:
+        user.latitude = user.longitude = None
+        user.geohash = ''
+    else:
+        user.latitude, user.longitude = point
+        user.geohash = geohash_encode(*point)
+    return point
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.cache_utils import bump_version
+from apps.pets.signals import PETS_NAMESPACE
+from apps.users.geo import geocode_user
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Geocode shelter addresses against the bundled ZIP centroid table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-geocode shelters that already have coordinates')
+
+    def handle(self, *args, **options):
+        shelters = User.objects.filter(user_type='shelter')
+        if not options['all']:
+            shelters = shelters.filter(latitude__isnull=True)
+
+        located = missing = 0
+        for shelter in shelters.iterator():
+            if geocode_user(shelter):
+                located += 1
+            else:
+                missing += 1
+            User.objects.filter(pk=shelter.pk).update(
+                latitude=shelter.latitude, longitude=shelter.longitude, geohash=shelter.geohash
+            )
+
+        bump_version(PETS_NAMESPACE)
+        self.stdout.write(self.style.SUCCESS(f'Geocoded {located} shelters.'))
+        if missing:
+            self.stdout.write(self.style.WARNING(f'{missing} shelters could not be located.'))
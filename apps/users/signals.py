@@ -0,0 +1,53 @@
+"""
+Signal handlers geocoding shelters and propagating their changes to pet
+caches and indexes
+"""
+from django.db import transaction
+from django.db.models.signals import post_init, pre_save, post_save
+from django.dispatch import receiver
+
+from apps.core.cache_utils import bump_version
+from apps.pets.signals import PETS_NAMESPACE
+from .geo import geocode_user
+from .models import User, ShelterProfile
+
+
+LOCATION_FIELDS = ('city', 'state', 'zip_code')
+
+
+def _location(user):
+    return tuple(getattr(user, field) for field in LOCATION_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_location(sender, instance, **kwargs):
+    # Compared on save instead of re-reading the row; unknown when deferred
+    if instance.pk is None or instance.get_deferred_fields() & set(LOCATION_FIELDS):
+        instance._loaded_location = None
+    else:
+        instance._loaded_location = _location(instance)
+
+
+@receiver(pre_save, sender=User)
+def geocode_shelter(sender, instance, **kwargs):
+    if instance.user_type != 'shelter':
+        return
+    if getattr(instance, '_loaded_location', None) != _location(instance) or instance.latitude is None:
+        geocode_user(instance)
+
+
+@receiver(post_save, sender=User)
+def shelter_location_changed(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_loaded_location', None)
+    instance._loaded_location = _location(instance)
+    if instance.user_type != 'shelter' or created:
+        return
+    if previous != instance._loaded_location:
+        # Shelter location is part of the searchable pet catalog
+        transaction.on_commit(lambda: bump_version(PETS_NAMESPACE))
+
+
+@receiver(post_save, sender=ShelterProfile)
+def shelter_profile_changed(sender, instance, **kwargs):
+    # Organization names are shown on pet cards and offered as completions
+    transaction.on_commit(lambda: bump_version(PETS_NAMESPACE))
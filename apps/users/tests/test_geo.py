@@ -0,0 +1,30 @@
+import math
+
+from django.test import SimpleTestCase
+
+from apps.users.geo import EARTH_RADIUS_MILES, covering_cells, geohash_encode, haversine_miles
+
+
+def _point_at(center, miles, bearing):
+    distance = miles / EARTH_RADIUS_MILES
+    latitude = center[0] + math.degrees(distance * math.cos(bearing))
+    longitude = center[1] + math.degrees(distance * math.sin(bearing)) / math.cos(math.radians(latitude))
+    return latitude, longitude
+
+
+class CoveringCellsTests(SimpleTestCase):
+    def assertCovered(self, center, radius_miles):
+        cells = covering_cells(center, radius_miles)
+        for step in range(72):
+            point = _point_at(center, radius_miles * 0.99, math.radians(step * 5))
+            self.assertLessEqual(haversine_miles(center, point), radius_miles)
+            geohash = geohash_encode(*point)
+            self.assertTrue(any(geohash.startswith(cell) for cell in cells), (point, cells))
+
+    def test_circle_edge_is_covered_at_mid_latitudes(self):
+        self.assertCovered((40.7128, -74.0060), 24)
+
+    def test_circle_edge_is_covered_at_high_latitudes(self):
+        # Cells are far narrower than their equatorial width near Fairbanks
+        for radius_miles in (3, 12, 24, 90):
+            self.assertCovered((64.8378, -147.7164), radius_miles)